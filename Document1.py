@@ -1,11 +1,18 @@
 #import modules
 import random
+import re
 import tkinter as tk
 from tkinter import ttk
-import winsound  # for sound effects
 import json
+import sqlite3
+import bisect
+try:
+    import orjson  # optional C-accelerated JSON for the profile/sync files
+except ImportError:
+    orjson = None
 import os  # for file operations
 import logging
+import logging.handlers
 # Do not import optional heavy dependencies at module-import time. Use a
 # lazy helper below to import `requests` only when needed. This avoids
 # static-analysis errors in environments where `requests` isn't installed
@@ -13,15 +20,22 @@ import logging
 requests = None
 import datetime
 import threading
+import queue
 import uuid
+import secrets
 import sys
 import time
 import ctypes
+import atexit
+import functools
+from collections import deque
+from dataclasses import dataclass, field
 # wmi is optional; if not installed we'll leave it as None and the code
 # will fall back to Windows API checks. Avoid importing at module import
 # time so static analysis doesn't flag unresolved imports in dev envs.
 wmi = None
 from pathlib import Path
+from types import MappingProxyType
 
 # Space Invaders inspired theme shared for this file
 THEME = {
@@ -50,15 +64,150 @@ THEME.update({
 })
 
 
+def _json_dumps(obj):
+    """Serialize to UTF-8 JSON bytes, using orjson when it's installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _json_loads(data):
+    """Parse JSON bytes/str, using orjson when it's installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+_now_cache = {'t': -1.0, 'dt': None}
+
+def cached_now():
+    """datetime.now(), shared by everything that runs in the same Tk event"""
+    t = time.monotonic()
+    if t - _now_cache['t'] > 0.05:
+        _now_cache['dt'] = datetime.datetime.now()
+        _now_cache['t'] = t
+    return _now_cache['dt']
+
+
 def _get_requests():
     """Lazily import and return the requests module or None if unavailable."""
+    global requests
+    if requests is None:
+        try:
+            import importlib
+            requests = importlib.import_module('requests')
+        except Exception:
+            return None
+    return requests
+
+
+def _get_wmi():
+    """Lazily import and return the wmi module or None if unavailable.
+
+    Only the keyboard detection needs wmi, so the (slow) COM import is
+    deferred until the first check instead of happening at startup.
+    """
+    global wmi
+    if wmi is None:
+        try:
+            import importlib
+            wmi = importlib.import_module('wmi')
+        except Exception:
+            return None
+    return wmi
+
+# Win32 structures and typed entry points, resolved once at import so ctypes
+# doesn't have to look up and guess argument conversions on every call.
+# Everything is None when not running on Windows (or the export is missing);
+# callers already treat a failing call as "use the fallback".
+class OSVERSIONINFOEXW(ctypes.Structure):
+    _fields_ = [('dwOSVersionInfoSize', ctypes.c_ulong),
+                ('dwMajorVersion', ctypes.c_ulong),
+                ('dwMinorVersion', ctypes.c_ulong),
+                ('dwBuildNumber', ctypes.c_ulong),
+                ('dwPlatformId', ctypes.c_ulong),
+                ('szCSDVersion', ctypes.c_wchar * 128),
+                ('wServicePackMajor', ctypes.c_ushort),
+                ('wServicePackMinor', ctypes.c_ushort),
+                ('wSuiteMask', ctypes.c_ushort),
+                ('wProductType', ctypes.c_byte),
+                ('wReserved', ctypes.c_byte)]
+
+
+class RAWINPUTDEVICELIST(ctypes.Structure):
+    _fields_ = [
+        ("hDevice", ctypes.c_void_p),
+        ("dwType", ctypes.c_uint32)
+    ]
+
+
+def _load_dll(name):
     try:
-        import importlib
-        req = importlib.import_module('requests')
-        return req
-    except Exception:
+        return ctypes.WinDLL(name, use_last_error=True)
+    except (AttributeError, OSError):  # not Windows, or DLL not present
         return None
 
+
+def _bind(dll, name, argtypes, restype):
+    """Return a typed function from dll, or None if it isn't exported."""
+    if dll is None:
+        return None
+    try:
+        func = getattr(dll, name)
+    except AttributeError:
+        return None
+    func.argtypes = argtypes
+    func.restype = restype
+    return func
+
+
+_user32 = _load_dll('user32')
+_shcore = _load_dll('shcore')
+_ntdll = _load_dll('ntdll')
+
+_GetSystemMetrics = _bind(_user32, 'GetSystemMetrics', [ctypes.c_int], ctypes.c_int)
+_GetSystemMetricsForDpi = _bind(_user32, 'GetSystemMetricsForDpi', [ctypes.c_int, ctypes.c_uint], ctypes.c_int)
+_GetDpiForSystem = _bind(_user32, 'GetDpiForSystem', [], ctypes.c_uint)
+_MonitorFromWindow = _bind(_user32, 'MonitorFromWindow', [ctypes.c_void_p, ctypes.c_uint], ctypes.c_void_p)
+_GetRawInputDeviceList = _bind(_user32, 'GetRawInputDeviceList',
+                               [ctypes.POINTER(RAWINPUTDEVICELIST), ctypes.POINTER(ctypes.c_uint), ctypes.c_uint],
+                               ctypes.c_uint)
+_SetProcessDpiAwarenessContext = _bind(_user32, 'SetProcessDpiAwarenessContext', [ctypes.c_void_p], ctypes.c_int)
+DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2 = -4
+_GetProcessDpiAwareness = _bind(_shcore, 'GetProcessDpiAwareness', [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)], ctypes.c_long)
+_SetProcessDpiAwareness = _bind(_shcore, 'SetProcessDpiAwareness', [ctypes.c_int], ctypes.c_long)
+_GetDpiForMonitor = _bind(_shcore, 'GetDpiForMonitor',
+                          [ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint)],
+                          ctypes.c_long)
+_RtlGetVersion = _bind(_ntdll, 'RtlGetVersion', [ctypes.POINTER(OSVERSIONINFOEXW)], ctypes.c_long)
+
+# Host capabilities don't change while the app runs, so check them once
+@functools.lru_cache(maxsize=1)
+def _is_foldable_host():
+    try:
+        # Try to get Windows build number
+        win_ver = sys.getwindowsversion()
+        if win_ver.major >= 10:  # Windows 10 or higher
+            # Get more detailed version info from Windows API
+            os_version = OSVERSIONINFOEXW()
+            os_version.dwOSVersionInfoSize = ctypes.sizeof(os_version)
+            _RtlGetVersion(ctypes.byref(os_version))
+
+            # Check for Windows 11 builds that support foldables
+            return os_version.dwBuildNumber >= 22000
+    except Exception:
+        pass
+    return False
+
+
+@functools.lru_cache(maxsize=1)
+def _max_touch_points():
+    try:
+        # Check Windows touch point capabilities
+        return _GetSystemMetrics(95)  # SM_MAXIMUMTOUCHES
+    except Exception:
+        return 0
+
 class LayoutManager:
     def __init__(self, root):
         self.root = root
@@ -68,6 +217,13 @@ class LayoutManager:
         self.min_height = 600
         self.is_foldable = self._check_foldable_support()
         self.current_orientation = "landscape"
+        self._metrics_cache = None  # (screen_width, screen_height, dpi_scaling)
+        self._metrics_after = None  # pending debounced recompute
+        self._last_size = None
+        self._monitor_metrics = {}  # HMONITOR -> (width, height, dpi_scaling)
+        # Per-instance memo of the scaled sizes; cleared when the metrics change
+        self.get_font_size = functools.lru_cache(maxsize=64)(self._get_font_size)
+        self.get_widget_size = functools.lru_cache(maxsize=64)(self._get_widget_size)
         self.update_screen_info()
         
         # Bind to screen changes
@@ -75,106 +231,136 @@ class LayoutManager:
         
     def _check_foldable_support(self):
         """Check if running on a foldable device (Windows 11 feature detection)"""
-        try:
-            # Try to get Windows build number
-            win_ver = sys.getwindowsversion()
-            if win_ver.major >= 10:  # Windows 10 or higher
-                # Get more detailed version info from Windows API
-                class OSVERSIONINFOEXW(ctypes.Structure):
-                    _fields_ = [('dwOSVersionInfoSize', ctypes.c_ulong),
-                              ('dwMajorVersion', ctypes.c_ulong),
-                              ('dwMinorVersion', ctypes.c_ulong),
-                              ('dwBuildNumber', ctypes.c_ulong),
-                              ('dwPlatformId', ctypes.c_ulong),
-                              ('szCSDVersion', ctypes.c_wchar * 128),
-                              ('wServicePackMajor', ctypes.c_ushort),
-                              ('wServicePackMinor', ctypes.c_ushort),
-                              ('wSuiteMask', ctypes.c_ushort),
-                              ('wProductType', ctypes.c_byte),
-                              ('wReserved', ctypes.c_byte)]
-
-                os_version = OSVERSIONINFOEXW()
-                os_version.dwOSVersionInfoSize = ctypes.sizeof(os_version)
-                retcode = ctypes.windll.Ntdll.RtlGetVersion(ctypes.byref(os_version))
-                
-                # Check for Windows 11 builds that support foldables
-                return os_version.dwBuildNumber >= 22000
-        except Exception:
-            pass
-        return False
+        return _is_foldable_host()
         
     def update_screen_info(self):
         """Update screen dimensions and DPI info"""
         try:
-            # Get primary screen metrics
-            user32 = ctypes.windll.user32
-            self.screen_width = user32.GetSystemMetrics(0)
-            self.screen_height = user32.GetSystemMetrics(1)
-            
-            # Get DPI awareness - helps with high DPI displays
-            awareness = ctypes.c_int()
-            errorCode = ctypes.windll.shcore.GetProcessDpiAwareness(0, ctypes.byref(awareness))
-            self.dpi_scaling = 1.0
-            if errorCode == 0:  # Success
-                if awareness.value == 0:  # DPI Unaware
-                    self.dpi_scaling = 1.0
-                elif awareness.value == 1:  # System DPI Aware
-                    self.dpi_scaling = user32.GetDpiForSystem() / 96.0
-                else:  # Per Monitor DPI Aware
-                    monitor = user32.MonitorFromWindow(self.root.winfo_id(), 0x02)  # MONITOR_DEFAULTTONEAREST
-                    dpi_x = ctypes.c_uint()
-                    dpi_y = ctypes.c_uint()
-                    ctypes.windll.shcore.GetDpiForMonitor(monitor, 0, ctypes.byref(dpi_x), ctypes.byref(dpi_y))
-                    self.dpi_scaling = dpi_x.value / 96.0
+            # Metrics for the monitor the window is currently on
+            monitor = _MonitorFromWindow(self.root.winfo_id(), 0x02)  # MONITOR_DEFAULTTONEAREST
+            metrics = self._monitor_metrics.get(monitor)
+            if metrics is None:
+                metrics = self._query_monitor_metrics(monitor)
+                self._monitor_metrics[monitor] = metrics
+            self.screen_width, self.screen_height, self.dpi_scaling = metrics
         except Exception as e:
             logging.warning(f"Error getting screen metrics: {e}")
             # Fallback to tk's screen dimensions
             self.screen_width = self.root.winfo_screenwidth()
             self.screen_height = self.root.winfo_screenheight()
             self.dpi_scaling = 1.0
-            
+
+        metrics = (self.screen_width, self.screen_height, self.dpi_scaling)
+        if metrics != self._metrics_cache:
+            self._metrics_cache = metrics
+            # Precompute scale factors so get_font_size/get_widget_size are a multiply
+            self._scale_w = min(1.0, self.screen_width / self.base_width)
+            self._scale_h = min(1.0, self.screen_height / self.base_height)
+            self._scale_font = min(
+                min(1.0, self.screen_width / (self.base_width * self.dpi_scaling)),
+                min(1.0, self.screen_height / (self.base_height * self.dpi_scaling))
+            )
+            self.get_font_size.cache_clear()
+            self.get_widget_size.cache_clear()
+
         # Update orientation
         old_orientation = self.current_orientation
         self.current_orientation = "portrait" if self.screen_height > self.screen_width else "landscape"
         return old_orientation != self.current_orientation
             
-    def get_font_size(self, base_size):
+    def _get_font_size(self, base_size):
         """Scale font size based on screen dimensions and DPI"""
-        width_scale = min(1.0, self.screen_width / (self.base_width * self.dpi_scaling))
-        height_scale = min(1.0, self.screen_height / (self.base_height * self.dpi_scaling))
-        scale = min(width_scale, height_scale)
-        return max(8, int(base_size * scale))  # minimum 8pt font
+        return max(8, int(base_size * self._scale_font))  # minimum 8pt font
         
-    def get_widget_size(self, base_width, base_height=None):
+    def _get_widget_size(self, base_width, base_height=None):
         """Scale widget dimensions"""
         if base_height is None:
             base_height = base_width
-            
-        width_scale = min(1.0, self.screen_width / self.base_width)
-        height_scale = min(1.0, self.screen_height / self.base_height)
-        
-        width = max(50, int(base_width * width_scale))
-        height = max(50, int(base_height * height_scale))
+        width = max(50, int(base_width * self._scale_w))
+        height = max(50, int(base_height * self._scale_h))
         return width, height
         
+    def _query_monitor_metrics(self, monitor):
+        """Read (width, height, dpi_scaling) for a single monitor"""
+        dpi_x = ctypes.c_uint()
+        dpi_y = ctypes.c_uint()
+        if _GetDpiForMonitor(monitor, 0, ctypes.byref(dpi_x), ctypes.byref(dpi_y)) == 0:  # MDT_EFFECTIVE_DPI
+            dpi = dpi_x.value
+        else:
+            dpi = 96
+
+        # Get DPI awareness - helps with high DPI displays
+        awareness = ctypes.c_int()
+        errorCode = _GetProcessDpiAwareness(None, ctypes.byref(awareness))
+        dpi_scaling = 1.0
+        if errorCode == 0:  # Success
+            if awareness.value == 0:  # DPI Unaware
+                dpi_scaling = 1.0
+            elif awareness.value == 1:  # System DPI Aware
+                dpi_scaling = _GetDpiForSystem() / 96.0
+            else:  # Per Monitor DPI Aware
+                dpi_scaling = dpi / 96.0
+
+        # GetSystemMetricsForDpi is per-monitor aware (Windows 10 1607+)
+        if _GetSystemMetricsForDpi is not None:
+            width = _GetSystemMetricsForDpi(0, dpi)
+            height = _GetSystemMetricsForDpi(1, dpi)
+        else:
+            # Older builds only have the primary-monitor values
+            width = _GetSystemMetrics(0)
+            height = _GetSystemMetrics(1)
+        return width, height, dpi_scaling
+
     def _on_window_configure(self, event=None):
         """Handle window resize events"""
         if event and event.widget == self.root:
-            orientation_changed = self.update_screen_info()
-            if orientation_changed and hasattr(self, 'on_orientation_change'):
-                self.on_orientation_change(self.current_orientation)
+            size = (event.width, event.height)
+            if size == self._last_size:
+                return  # window moved but wasn't resized
+            self._last_size = size
+            # <Configure> fires for every pixel of a drag, so wait for it to settle
+            if self._metrics_after is not None:
+                self.root.after_cancel(self._metrics_after)
+            self._metrics_after = self.root.after(100, self._recompute_metrics)
+
+    def _recompute_metrics(self):
+        """Debounced screen metrics refresh"""
+        self._metrics_after = None
+        old_metrics = self._metrics_cache
+        orientation_changed = self.update_screen_info()
+        if self._metrics_cache == old_metrics:
+            return  # same monitor/DPI as before
+        if orientation_changed and hasattr(self, 'on_orientation_change'):
+            self.on_orientation_change(self.current_orientation)
 
 # Touch screen and virtual keyboard support
+SWIPE_DIST_SQ = 50 * 50  # squared swipe distance in pixels
+_NO_GESTURE = -1 << 30  # no touch in progress
+
 class TouchScreenManager:
+    # Shared option dicts for the virtual keyboard buttons
+    _BTN_KW = dict(font=('Arial', 14), bg=THEME['muted'], fg=THEME['btn_text'],
+                   activebackground=THEME['muted'])
+    _NUM_KW = dict(font=('Arial', 18), bg=THEME['btn'], fg=THEME['btn_text'],
+                   activebackground=THEME['accent'])
+    _DONE_KW = dict(font=('Arial', 14), bg=THEME['btn'], fg=THEME['btn_text'],
+                    activebackground=THEME['accent'])
+
     def __init__(self, root):
         self.root = root
         self.touch_enabled = self._check_touch_support()
         self.virtual_kbd = None
+        self._kbd_cache = {}  # 'numeric' / 'full' -> withdrawn Toplevel
+        self.shift_on = False
+        self._letter_buttons = []
+        self._letter_original = []
         self.current_entry = None
-        self.gesture_start = None
+        self._gx = self._gy = _NO_GESTURE  # touch-down point, sentinel when idle
         self.last_tap_time = 0
         self.external_kbd_connected = False
-        
+        self._wmi_conn = None
+        self._kbd_device_key = None  # hash of the last seen keyboard device names
+
         # Start keyboard detection
         self._check_external_keyboard()
         # Set up periodic check for keyboard changes
@@ -182,99 +368,171 @@ class TouchScreenManager:
         
     def _check_touch_support(self):
         """Check if device supports touch input"""
-        try:
-            # Check Windows touch point capabilities
-            user32 = ctypes.windll.user32
-            touch_points = user32.GetSystemMetrics(95)  # SM_MAXIMUMTOUCHES
-            return touch_points > 0
-        except Exception:
-            return False
+        return _max_touch_points() > 0
             
     def _check_external_keyboard(self):
-        """Check for external keyboards (Bluetooth or USB)"""
+        """Check for external keyboards (Bluetooth or USB) from the Tk thread"""
+        conn = None
+        if _get_wmi() is not None:
+            try:
+                # Reuse one connection; only ever used from the Tk thread
+                if self._wmi_conn is None:
+                    self._wmi_conn = wmi.WMI()
+                conn = self._wmi_conn
+            except Exception as e:
+                logging.warning(f"Error checking keyboards: {e}")
+                self._set_external_keyboard(False)
+                return
+        self._set_external_keyboard(self._detect_external_keyboard(conn))
+
+    def _detect_external_keyboard(self, conn=None):
+        """Return True if an external keyboard is connected.
+
+        conn is a WMI connection owned by the calling thread (COM objects can't
+        be shared between threads); without one the raw input list is used.
+        Doesn't touch Tk, so it is safe to call from the watcher thread.
+        """
         try:
-            has_external = False
-            if wmi is not None:
+            if conn is not None:
                 try:
-                    c = wmi.WMI()
-                    keyboards = c.Win32_Keyboard() or []
-                    bt_devices = c.Win32_PnPEntity(PNPClass="Bluetooth") or []
-                    bt_kbd_count = sum(1 for dev in bt_devices
-                                       if "keyboard" in getattr(dev, "Name", "").lower() or
-                                          "input device" in getattr(dev, "Name", "").lower())
-                    usb_kbd_count = sum(1 for kbd in keyboards
-                                        if "usb" in getattr(kbd, "Name", "").lower() or
-                                           "bluetooth" in getattr(kbd, "Name", "").lower())
-                    has_external = (bt_kbd_count > 0) or (usb_kbd_count > 1)
+                    # Only fetch Name - wmi's query() already runs forward-only/return-immediately
+                    kbd_names = tuple((getattr(kbd, "Name", "") or "").lower()
+                                      for kbd in conn.query("SELECT Name FROM Win32_Keyboard"))
+                    bt_names = tuple((getattr(dev, "Name", "") or "").lower()
+                                     for dev in conn.query("SELECT Name FROM Win32_PnPEntity WHERE PNPClass='Bluetooth'"))
+                    device_key = hash((kbd_names, bt_names))
+                    if device_key == self._kbd_device_key:
+                        # Same devices as last time - reuse the previous answer
+                        return self.external_kbd_connected
+                    bt_kbd_count = sum(1 for name in bt_names
+                                       if "keyboard" in name or "input device" in name)
+                    usb_kbd_count = sum(1 for name in kbd_names
+                                        if "usb" in name or "bluetooth" in name)
+                    self._kbd_device_key = device_key
+                    return (bt_kbd_count > 0) or (usb_kbd_count > 1)
                 except Exception:
-                    has_external = False
+                    self._kbd_device_key = None
+                    return False
             else:
                 # Fallback: Check Windows API for connected devices
                 try:
-                    class RAWINPUTDEVICELIST(ctypes.Structure):
-                        _fields_ = [
-                            ("hDevice", ctypes.c_void_p),
-                            ("dwType", ctypes.c_uint32)
-                        ]
-
-                    GetRawInputDeviceList = ctypes.windll.user32.GetRawInputDeviceList
-                    devices = (RAWINPUTDEVICELIST * 256)()
-                    device_count = ctypes.c_uint32(256)
                     size = ctypes.sizeof(RAWINPUTDEVICELIST)
 
-                    GetRawInputDeviceList(ctypes.byref(devices),
-                                          ctypes.byref(device_count),
-                                          size)
+                    # First call with no buffer just reports the device count,
+                    # then allocate exactly that many entries
+                    device_count = ctypes.c_uint(0)
+                    if _GetRawInputDeviceList(None, ctypes.byref(device_count), size) == 0xFFFFFFFF:
+                        raise ctypes.WinError(ctypes.get_last_error())
+                    devices = (RAWINPUTDEVICELIST * device_count.value)()
+                    if _GetRawInputDeviceList(devices, ctypes.byref(device_count), size) == 0xFFFFFFFF:
+                        raise ctypes.WinError(ctypes.get_last_error())
 
                     kbd_count = sum(1 for d in devices[:device_count.value]
-                                    if d.dwType == 1)
-                    has_external = kbd_count > 1
+                                    if d.dwType == 1)  # RIM_TYPEKEYBOARD
+                    return kbd_count > 1
                 except Exception:
-                    has_external = False
-
-            old_state = self.external_kbd_connected
-            self.external_kbd_connected = has_external
-
-            # Log keyboard connection changes
-            if old_state != self.external_kbd_connected:
-                if self.external_kbd_connected:
-                    logging.info("External keyboard connected - disabling virtual keyboard")
-                    self.hide_keyboard()  # Hide virtual keyboard if showing
-                else:
-                    logging.info("External keyboard disconnected - virtual keyboard enabled")
+                    return False
 
         except Exception as e:
             logging.warning(f"Error checking keyboards: {e}")
             # Default to not blocking virtual keyboard on error
-            self.external_kbd_connected = False
+            return False
+
+    def _set_external_keyboard(self, has_external):
+        """Apply a keyboard check result (Tk thread)"""
+        old_state = self.external_kbd_connected
+        self.external_kbd_connected = has_external
+
+        # Log keyboard connection changes
+        if old_state != has_external:
+            if has_external:
+                logging.info("External keyboard connected - disabling virtual keyboard")
+                self.hide_keyboard()  # Hide virtual keyboard if showing
+            else:
+                logging.info("External keyboard disconnected - virtual keyboard enabled")
             
     def _schedule_kbd_check(self):
-        """Schedule periodic checks for keyboard connection changes"""
-        # Check every 5 seconds for keyboard changes
+        """Start watching for keyboard connection changes"""
+        if _get_wmi() is not None:
+            # Let WMI tell us when a device arrives/leaves instead of polling
+            threading.Thread(target=self._watch_kbd_events, daemon=True).start()
+        else:
+            # No event source without wmi - fall back to checking every 5 seconds
+            self.root.after(5000, self._poll_kbd_check)
+
+    def _poll_kbd_check(self):
+        """Periodic keyboard check used when WMI events are unavailable"""
         self._check_external_keyboard()
-        self.root.after(5000, self._schedule_kbd_check)
+        self.root.after(5000, self._poll_kbd_check)
+
+    def _watch_kbd_events(self):
+        """Background thread: wait for PnP device arrival/removal events"""
+        try:
+            # WMI is COM based, so each thread needs its own COM apartment
+            try:
+                import pythoncom
+                pythoncom.CoInitialize()
+            except ImportError:
+                pass
+            c = wmi.WMI()
+            watchers = [
+                c.watch_for(notification_type="Creation", wmi_class="Win32_PnPEntity", delay_secs=2),
+                c.watch_for(notification_type="Deletion", wmi_class="Win32_PnPEntity", delay_secs=2)
+            ]
+            while True:
+                for watcher in watchers:
+                    try:
+                        watcher(timeout_ms=1000)
+                    except wmi.x_wmi_timed_out:
+                        continue
+                    # Re-check here with this thread's connection, post only the result
+                    has_external = self._detect_external_keyboard(c)
+                    self.root.after(0, self._set_external_keyboard, has_external)
+        except Exception as e:
+            logging.warning(f"Keyboard event watcher stopped: {e}")
             
     def create_virtual_keyboard(self, numeric_only=False):
-        """Create virtual keyboard window"""
-        if self.virtual_kbd:
-            self.virtual_kbd.destroy()
-            
-        self.virtual_kbd = tk.Toplevel(self.root)
-        self.virtual_kbd.overrideredirect(True)  # No window decorations
-        self.virtual_kbd.attributes('-topmost', True)  # Stay on top
+        """Return the keyboard window for this mode, building it on first use"""
+        mode = 'numeric' if numeric_only else 'full'
+        kbd = self._kbd_cache.get(mode)
+        if kbd is not None:
+            self.virtual_kbd = kbd
+            return kbd
+
+        self.virtual_kbd = kbd = tk.Toplevel(self.root)
+        kbd.withdraw()  # stay hidden until show_keyboard places it
+        kbd.overrideredirect(True)  # No window decorations
+        kbd.attributes('-topmost', True)  # Stay on top
         
         # Use a dark theme for keyboard
-        self.virtual_kbd.configure(bg=THEME['bg'])
+        kbd.configure(bg=THEME['bg'])
         
         if numeric_only:
             self._create_numeric_keyboard()
         else:
             self._create_full_keyboard()
+
+        # Add a small indicator that external keyboard can be used
+        tk.Label(kbd,
+                 text="Tip: You can also use a physical keyboard",
+                 font=('Arial', 10),
+                 fg=THEME['muted'],
+                 bg=THEME['bg']).pack(pady=(0, 5))
+
+        self._kbd_cache[mode] = kbd
+        return kbd
+
+    def invalidate_keyboards(self, *_):
+        """Drop cached keyboards so they are rebuilt for the new layout"""
+        for kbd in self._kbd_cache.values():
+            kbd.destroy()
+        self._kbd_cache.clear()
+        self.virtual_kbd = None
+        self.current_entry = None
             
     def _create_numeric_keyboard(self):
         """Create numeric keypad layout"""
         keys_frame = tk.Frame(self.virtual_kbd, bg=THEME['bg'])
-        keys_frame.pack(padx=5, pady=5)
 
         # Number pad layout
         num_keys = [
@@ -284,29 +542,25 @@ class TouchScreenManager:
             ['.', '0', '⌫']  # Backspace
         ]
 
-        for row in num_keys:
-            frame = tk.Frame(keys_frame, bg=THEME['bg'])
-            frame.pack()
-            for key in row:
-                cmd = lambda x=key: self._press_key(x)
-                btn = tk.Button(frame, text=key, width=5, height=2,
-                                font=('Arial', 18),
-                                bg=THEME['btn'], fg=THEME['btn_text'],
-                                activebackground=THEME['accent'],
-                                command=cmd)
-                btn.pack(side=tk.LEFT, padx=2, pady=2)
+        # One grid for all keys instead of a packed Frame per row
+        for r, row in enumerate(num_keys):
+            for c, key in enumerate(row):
+                tk.Button(keys_frame, text=key, width=5, height=2,
+                          command=functools.partial(self._press_key, key),
+                          **self._NUM_KW).grid(row=r, column=c, padx=2, pady=2, sticky='nsew')
+        for r in range(len(num_keys)):
+            keys_frame.grid_rowconfigure(r, weight=1)
+        for c in range(3):
+            keys_frame.grid_columnconfigure(c, weight=1)
+        keys_frame.pack(padx=5, pady=5)
 
         # Add done button
         tk.Button(self.virtual_kbd, text='Done', width=20, height=2,
-                  font=('Arial', 14),
-                  bg=THEME['btn'], fg=THEME['btn_text'],
-                  activebackground=THEME['accent'],
-                  command=self.hide_keyboard).pack(pady=5)
-                
+                  command=self.hide_keyboard, **self._DONE_KW).pack(pady=5)
+
     def _create_full_keyboard(self):
         """Create full alphanumeric keyboard layout"""
         keys_frame = tk.Frame(self.virtual_kbd, bg=THEME['bg'])
-        keys_frame.pack(padx=5, pady=5)
 
         # Standard QWERTY layout
         key_rows = [
@@ -315,48 +569,49 @@ class TouchScreenManager:
             ['a', 's', 'd', 'f', 'g', 'h', 'j', 'k', 'l'],
             ['⇧', 'z', 'x', 'c', 'v', 'b', 'n', 'm', '⌫']
         ]
+        columns = max(len(row) for row in key_rows)
 
         self.shift_on = False
-        for row in key_rows:
-            frame = tk.Frame(keys_frame, bg=THEME['bg'])
-            frame.pack()
-            for key in row:
-                cmd = lambda x=key: self._press_key(x)
-                btn = tk.Button(frame, text=key, width=4, height=2,
-                               font=('Arial', 14),
-                               bg=THEME['muted'], fg=THEME['btn_text'],
-                               activebackground=THEME['muted'],
-                               command=cmd)
-                btn.pack(side=tk.LEFT, padx=2, pady=2)
-
-        # Spacebar and Done buttons
+        # Letter keys and their lowercase labels, flipped by shift
+        self._letter_buttons = []
+        self._letter_original = []
+        # One grid for all keys instead of a packed Frame per row
+        for r, row in enumerate(key_rows):
+            for c, key in enumerate(row):
+                btn = tk.Button(keys_frame, text=key, width=4, height=2,
+                                command=functools.partial(self._press_key, key),
+                                **self._BTN_KW)
+                btn.grid(row=r, column=c, padx=2, pady=2, sticky='nsew')
+                if key.isalpha():
+                    self._letter_buttons.append(btn)
+                    self._letter_original.append(key)
+
+        # Spacebar spans the whole bottom row
         tk.Button(keys_frame, text='Space', width=30, height=2,
-                  font=('Arial', 14),
-                  bg=THEME['muted'], fg=THEME['btn_text'],
-                  activebackground=THEME['muted'],
-                  command=lambda: self._press_key(' ')).pack(pady=2)
+                  command=functools.partial(self._press_key, ' '),
+                  **self._BTN_KW).grid(row=len(key_rows), column=0, columnspan=columns,
+                                       padx=2, pady=2, sticky='nsew')
+        for r in range(len(key_rows) + 1):
+            keys_frame.grid_rowconfigure(r, weight=1)
+        for c in range(columns):
+            keys_frame.grid_columnconfigure(c, weight=1)
+        keys_frame.pack(padx=5, pady=5)
 
         tk.Button(self.virtual_kbd, text='Done', width=20, height=2,
-                  font=('Arial', 14),
-                  bg=THEME['btn'], fg=THEME['btn_text'],
-                  activebackground=THEME['accent'],
-                  command=self.hide_keyboard).pack(pady=5)
-                
+                  command=self.hide_keyboard, **self._DONE_KW).pack(pady=5)
+
     def _press_key(self, key):
         """Handle virtual key press"""
         if not self.current_entry:
             return
             
         if key == '⌫':  # Backspace
-            self.current_entry.delete(len(self.current_entry.get())-1, tk.END)
+            self.current_entry.delete(self.current_entry.index(tk.END) - 1, tk.END)
         elif key == '⇧':  # Shift
             self.shift_on = not self.shift_on
             # Update key labels
-            for child in self.virtual_kbd.winfo_children():
-                if isinstance(child, tk.Frame):
-                    for btn in child.winfo_children():
-                        if isinstance(btn, tk.Button) and len(btn['text']) == 1:
-                            btn['text'] = btn['text'].upper() if self.shift_on else btn['text'].lower()
+            for btn, orig in zip(self._letter_buttons, self._letter_original):
+                btn.configure(text=orig.upper() if self.shift_on else orig)
         else:
             # Insert the key (shifted if shift is on)
             insert_key = key.upper() if self.shift_on else key
@@ -371,13 +626,21 @@ class TouchScreenManager:
         if self.external_kbd_connected:
             return
             
-        # Refresh keyboard check before showing
-        self._check_external_keyboard()
+        # Refresh keyboard check before showing; with WMI the watcher thread
+        # keeps the state current, so only the cheap raw input check runs here
+        if _get_wmi() is None:
+            self._check_external_keyboard()
         if self.external_kbd_connected:
             return
             
+        # Only one keyboard is visible at a time
+        if self.virtual_kbd is not None:
+            self.virtual_kbd.withdraw()
+
         self.current_entry = entry_widget
-        self.create_virtual_keyboard(numeric_only=numeric)
+        kbd = self.create_virtual_keyboard(numeric_only=numeric)
+        if self.shift_on and not numeric:  # don't reopen with shift still latched
+            self._press_key('⇧')
         
         # Position keyboard at bottom of screen
         screen_width = self.root.winfo_screenwidth()
@@ -385,20 +648,14 @@ class TouchScreenManager:
         kbd_width = min(screen_width, 800)  # Max width 800px
         kbd_height = min(screen_height // 3, 400)  # Max 1/3 of screen height
         
-        self.virtual_kbd.geometry(f"{kbd_width}x{kbd_height}+{(screen_width-kbd_width)//2}+{screen_height-kbd_height}")
-        
-        # Add a small indicator that external keyboard can be used
-        indicator = tk.Label(self.virtual_kbd,
-                             text="Tip: You can also use a physical keyboard",
-                             font=('Arial', 10),
-                             fg=THEME['muted'],
-                             bg=THEME['bg'])
-        indicator.pack(pady=(0, 5))
+        kbd.geometry(f"{kbd_width}x{kbd_height}+{(screen_width-kbd_width)//2}+{screen_height-kbd_height}")
+        kbd.deiconify()
+        kbd.lift()
         
     def hide_keyboard(self):
         """Hide the virtual keyboard"""
         if self.virtual_kbd:
-            self.virtual_kbd.destroy()
+            self.virtual_kbd.withdraw()  # kept in _kbd_cache for next time
             self.virtual_kbd = None
         self.current_entry = None
         
@@ -414,33 +671,36 @@ class TouchScreenManager:
             
     def _touch_start(self, event):
         """Handle touch start event"""
-        self.gesture_start = (event.x, event.y)
+        self._gx = event.x
+        self._gy = event.y
         
         # Check for double-tap
         now = time.time()
         if now - self.last_tap_time < 0.3:  # 300ms window for double-tap
-            self._handle_double_tap(event)
+            self.root.after_idle(self._handle_double_tap, event)
         self.last_tap_time = now
         
     def _touch_move(self, event):
         """Handle touch move/drag event"""
-        if not self.gesture_start:
+        if self._gx == _NO_GESTURE:
             return
             
-        dx = event.x - self.gesture_start[0]
-        dy = event.y - self.gesture_start[1]
+        dx = event.x - self._gx
+        dy = event.y - self._gy
+        if dx * dx + dy * dy < SWIPE_DIST_SQ:  # not far enough to be a swipe yet
+            return
         
-        # Detect swipe gestures
-        if abs(dx) > 50:  # Horizontal swipe
-            self._handle_swipe('right' if dx > 0 else 'left')
-            self.gesture_start = None
-        elif abs(dy) > 50:  # Vertical swipe
-            self._handle_swipe('down' if dy > 0 else 'up')
-            self.gesture_start = None
+        # Dominant axis decides the swipe direction; the handler runs once
+        # the event loop is idle so this callback returns straight away
+        if abs(dx) > abs(dy):
+            self.root.after_idle(self._handle_swipe, 'right' if dx > 0 else 'left')
+        else:
+            self.root.after_idle(self._handle_swipe, 'down' if dy > 0 else 'up')
+        self._gx = _NO_GESTURE
             
     def _touch_end(self, event):
         """Handle touch end event"""
-        self.gesture_start = None
+        self._gx = _NO_GESTURE
         
     def _handle_swipe(self, direction):
         """Handle swipe gesture"""
@@ -467,26 +727,34 @@ touch_mgr = None
 def init_managers(root):
     """Initialize the layout and touch screen managers"""
     global layout_mgr, touch_mgr
+    # Enable DPI awareness before any screen metrics are read
+    _enable_dpi_awareness()
+
     layout_mgr = LayoutManager(root)
     touch_mgr = TouchScreenManager(root)
+    # Keyboards are sized for the screen, rebuild them after a rotation
+    layout_mgr.on_orientation_change = touch_mgr.invalidate_keyboards
+
+    # Configure minimum window size
+    root.minsize(layout_mgr.min_width, layout_mgr.min_height)
     return layout_mgr, touch_mgr
-    global layout_mgr
-    layout_mgr = LayoutManager(root)
-    
-    # Enable DPI awareness
+
+
+def _enable_dpi_awareness():
+    """Opt into per-monitor DPI awareness if the process is still DPI unaware"""
     try:
+        # Windows 10 1703+: per-monitor v2 also rescales dialogs and non-client areas
+        if _SetProcessDpiAwarenessContext is not None:
+            if _SetProcessDpiAwarenessContext(DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2):
+                return
         awareness = ctypes.c_int()
-        errorCode = ctypes.windll.shcore.GetProcessDpiAwareness(0, ctypes.byref(awareness))
+        errorCode = _GetProcessDpiAwareness(None, ctypes.byref(awareness))
         if errorCode == 0:
             if awareness.value == 0:  # DPI unaware
                 # Try to set per-monitor DPI awareness
-                ctypes.windll.shcore.SetProcessDpiAwareness(2)  # PROCESS_PER_MONITOR_DPI_AWARE
+                _SetProcessDpiAwareness(2)  # PROCESS_PER_MONITOR_DPI_AWARE
     except Exception:
         pass
-    
-    # Configure minimum window size
-    root.minsize(layout_mgr.min_width, layout_mgr.min_height)
-    return layout_mgr
 
 
 def init_layout_manager(root):
@@ -504,11 +772,21 @@ log_dir = Path.home() / "MathBlast_Logs"
 log_dir.mkdir(exist_ok=True)
 log_file = log_dir / "math_blast.log"
 
+# Buffer file logging so INFO chatter doesn't hit the disk on every record;
+# errors still flush straight away
+_log_file_handler = logging.FileHandler(log_file)
+# The buffer hands records to this handler, so it needs its own formatter
+_log_file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+_log_buffer = logging.handlers.MemoryHandler(capacity=200, flushLevel=logging.ERROR,
+                                             target=_log_file_handler)
+atexit.register(_log_file_handler.close)
+atexit.register(_log_buffer.flush)  # atexit runs last-registered first
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler(log_file),
+        _log_buffer,
         logging.StreamHandler(sys.stdout)
     ]
 )
@@ -518,13 +796,21 @@ SESSION_TIMEOUT = 1800  # 30 minutes in seconds
 # Server & sync configuration
 SERVER_URL = "http://math-blast-server.example.com"  # Replace with actual server URL when deployed
 SYNC_INTERVAL = 300  # Sync every 5 minutes
+HTTP_TIMEOUT = (2, 5)  # (connect, read) seconds, a dead server shouldn't hang us
 LAST_SYNC_KEY = "last_sync_timestamp"
 ANALYTICS_FILE = "math_blast_analytics.json"
+SESSIONS_FILE = "math_blast_sessions.jsonl"  # append-only, one record per line
+ANALYTICS_FLUSH_EVERY = 20  # problems between analytics writes
+ANALYTICS_FLUSH_SECS = 5.0  # ...or this many seconds since the last write
 
 class GameAnalytics:
     def __init__(self):
         self.session_id = str(uuid.uuid4())
         self.session_start = datetime.datetime.now()
+        self._dirty_count = 0
+        self._last_flush = time.monotonic()
+        # start_session runs on its own thread; guards the session index and log
+        self._session_lock = threading.Lock()
         self.load_analytics()
     
     def load_analytics(self):
@@ -546,13 +832,55 @@ class GameAnalytics:
         except Exception as e:
             logging.error(f"Error loading analytics: {e}")
             self.data = {'sessions': []}
+        self.data['sessions'] = self._load_sessions(self.data.get('sessions', []))
+        self._session_index = {s['id']: s for s in self.data['sessions']}
+
+    def _load_sessions(self, legacy_sessions):
+        """Replay the sessions log and rewrite it with one line per session"""
+        sessions = {s['id']: s for s in legacy_sessions if 'id' in s}
+        try:
+            if os.path.exists(SESSIONS_FILE):
+                with open(SESSIONS_FILE, 'r') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue  # torn write from a crash
+                        sessions.setdefault(record['id'], {}).update(record)
+            # Compact once at startup so later updates are plain appends
+            tmp = SESSIONS_FILE + '.tmp'
+            with open(tmp, 'w') as f:
+                for session in sessions.values():
+                    f.write(json.dumps(session, separators=(',', ':')) + '\n')
+            os.replace(tmp, SESSIONS_FILE)
+        except Exception as e:
+            logging.error(f"Error loading sessions: {e}")
+        return list(sessions.values())
+
+    def _append_session(self, record):
+        try:
+            with open(SESSIONS_FILE, 'a') as f:
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+        except Exception as e:
+            logging.error(f"Error saving session: {e}")
     
     def save_analytics(self):
+        # Sessions live in SESSIONS_FILE, keep them out of the summary file
+        summary = {k: v for k, v in self.data.items() if k != 'sessions'}
+        tmp = ANALYTICS_FILE + '.tmp'
         try:
-            with open(ANALYTICS_FILE, 'w') as f:
-                json.dump(self.data, f)
+            with open(tmp, 'w') as f:
+                json.dump(summary, f, separators=(',', ':'))
+            os.replace(tmp, ANALYTICS_FILE)
+            self._dirty_count = 0
+            self._last_flush = time.monotonic()
         except Exception as e:
             logging.error(f"Error saving analytics: {e}")
+
+    def flush(self):
+        """Write pending analytics changes, if any"""
+        if self._dirty_count:
+            self.save_analytics()
     
     def track_problem(self, problem_type, is_correct, time_taken):
         self.data['problems_by_type'][problem_type] = self.data['problems_by_type'].get(problem_type, 0) + 1
@@ -567,10 +895,14 @@ class GameAnalytics:
         self.data['average_time_per_problem'] = (old_avg * (total - 1) + time_taken) / total
         
         # Track peak hours
-        current_hour = datetime.datetime.now().hour
+        current_hour = cached_now().hour
         self.data['peak_hours'][current_hour] += 1
         
-        self.save_analytics()
+        # Batch writes instead of rewriting the file for every answer
+        self._dirty_count += 1
+        if (self._dirty_count >= ANALYTICS_FLUSH_EVERY
+                or time.monotonic() - self._last_flush > ANALYTICS_FLUSH_SECS):
+            self.save_analytics()
     
     def start_session(self, profile_name):
         session = {
@@ -581,34 +913,41 @@ class GameAnalytics:
             'correct_answers': 0,
             'highest_level': 1
         }
-        self.data['sessions'].append(session)
-        self.save_analytics()
+        with self._session_lock:
+            self.data['sessions'].append(session)
+            self._session_index[session['id']] = session
+            self._append_session(session)
     
     def update_session(self, problems_solved, correct_answers, highest_level):
-        for session in self.data['sessions']:
-            if session['id'] == self.session_id:
-                session['problems_solved'] = problems_solved
-                session['correct_answers'] = correct_answers
-                session['highest_level'] = highest_level
-                session['last_update'] = datetime.datetime.now().isoformat()
-                break
-        self.save_analytics()
+        with self._session_lock:
+            session = self._session_index.get(self.session_id)
+            if session:
+                changes = {
+                    'problems_solved': problems_solved,
+                    'correct_answers': correct_answers,
+                    'highest_level': highest_level,
+                    'last_update': datetime.datetime.now().isoformat()
+                }
+                session.update(changes)
+                self._append_session(dict(changes, id=self.session_id))
     
     def end_session(self):
-        for session in self.data['sessions']:
-            if session['id'] == self.session_id:
+        with self._session_lock:
+            session = self._session_index.get(self.session_id)
+            if session:
                 session['end_time'] = datetime.datetime.now().isoformat()
-                break
-        self.save_analytics()
+                self._append_session({'id': self.session_id, 'end_time': session['end_time']})
+        self.flush()
 
 # Initialize analytics
 analytics = GameAnalytics()
+atexit.register(analytics.flush)  # don't lose a partly filled batch on exit
 
-# Available avatars (emoji)
-AVATARS = ["👨", "👩", "🐱", "🐶", "🐼", "🐰", "🦊", "🐸", "🦁", "🐯", "🦄", "🐲"]
+# Available avatars (emoji) - read-only, so a tuple
+AVATARS = ("👨", "👩", "🐱", "🐶", "🐼", "🐰", "🦊", "🐸", "🦁", "🐯", "🦄", "🐲")
 
-# Achievement definitions
-ACHIEVEMENTS = {
+# Achievement definitions (read-only view)
+ACHIEVEMENTS = MappingProxyType({
     'beginner': {'name': '🌟 Math Rookie', 'desc': 'Complete your first game', 'icon': '🌟'},
     'speed_demon': {'name': '⚡ Speed Demon', 'desc': 'Answer 10 questions in under 30 seconds', 'icon': '⚡'},
     'perfect_10': {'name': '💯 Perfect 10', 'desc': 'Get 10 correct answers in a row', 'icon': '💯'},
@@ -619,15 +958,18 @@ ACHIEVEMENTS = {
     'speed_run': {'name': '🚀 Speed Runner', 'desc': 'Complete a level in under 2 minutes', 'icon': '🚀'},
     'division_master': {'name': '➗ Division Master', 'desc': 'Solve 20 division problems correctly', 'icon': '➗'},
     'multiplier': {'name': '✖️ Multiplication Master', 'desc': 'Solve 20 multiplication problems correctly', 'icon': '✖️'}
-}
+})
 
-# Challenge types
-CHALLENGE_TYPES = {
+# Challenge types (read-only view)
+CHALLENGE_TYPES = MappingProxyType({
     'speed': {'name': '⚡ Speed Battle', 'desc': 'First to solve 10 problems wins'},
     'endurance': {'name': '💪 Endurance Match', 'desc': 'Most correct answers in 5 minutes'},
     'precision': {'name': '🎯 Precision Duel', 'desc': 'First to make 3 mistakes loses'},
     'level_race': {'name': '🏃 Level Race', 'desc': 'First to complete the level wins'}
-}
+})
+
+# Stats where a sync merge keeps the larger of the local/server value
+MERGE_NUMERIC_KEYS = ('highest_level', 'total_correct', 'games_played', 'games_won')
 
 # Online game functions
 class OnlineManager:
@@ -637,21 +979,81 @@ class OnlineManager:
         self.online_status = False
         self.active_challenges = []
         self.offline_mode = True  # Start in offline mode
-        self.sync_timer = None
+        self._sync_thread = None  # background periodic sync
+        self._sync_stop = threading.Event()
         self.device_id = str(uuid.uuid4())  # Unique device identifier
+        self._http = None  # shared requests.Session, created on first use
+        # Network work queued from the UI runs on this one worker thread
+        self._jobs = queue.Queue()
+        threading.Thread(target=self._worker, daemon=True).start()
+        # Latest (tag, stats) per profile waiting to be pushed
+        self._pending_updates = {}
+        self._pending_lock = threading.Lock()
+
+    def submit(self, func, *args):
+        """Run func(*args) on the network worker thread"""
+        self._jobs.put((func, args))
+
+    def queue_profile_update(self, name, tag, stats):
+        """Push a profile update in the background, keeping only the newest per name"""
+        with self._pending_lock:
+            first = not self._pending_updates
+            self._pending_updates[name] = (tag, stats)
+        if first:
+            self.submit(self._push_profile_updates)
+
+    def _push_profile_updates(self):
+        with self._pending_lock:
+            batch = self._pending_updates
+            self._pending_updates = {}
+        for name, (tag, stats) in batch.items():
+            self.update_profile(name, tag, stats)
+
+    def _worker(self):
+        while True:
+            func, args = self._jobs.get()
+            try:
+                func(*args)
+            except Exception as e:
+                logging.error(f"Online task {getattr(func, '__name__', func)} failed: {e}")
+
+    def _get_http(self):
+        """Return a keep-alive session for the server, or None without requests"""
+        if self._http is None:
+            req = _get_requests()
+            if not req:
+                return None
+            session = req.Session()
+            # Retry dropped connections briefly before reporting offline
+            retry = req.adapters.Retry(total=2, backoff_factor=0.2)
+            adapter = req.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = 'MathBlast'
+            self._http = session
+        return self._http
+
+    def _request(self, method, path, **kwargs):
+        """Send a request over the shared session, None if the server can't be reached"""
+        http = self._get_http()
+        if http is None:
+            return None
+        try:
+            return http.request(method, f"{SERVER_URL}{path}", timeout=HTTP_TIMEOUT, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            logging.warning(f"Server unreachable: {e}")
+            self.online_status = False
+            return None
         
     def connect(self):
         """Connect to server and sync data"""
-        req = _get_requests()
-        if not req:
-            # requests not available in this environment
-            self.online_status = False
-            self.offline_mode = True
-            return False
-
         try:
-            response = req.post(f"{SERVER_URL}/connect", json={"player_id": self.player_id})
-            if response.status_code == 200:
+            response = self._request('POST', '/connect', json={"player_id": self.player_id})
+            if response is None:
+                # requests missing or server unreachable
+                self.online_status = False
+                self.offline_mode = True
+            elif response.status_code == 200:
                 self.online_status = True
                 self.offline_mode = False
                 return True
@@ -669,17 +1071,14 @@ class OnlineManager:
             if not self.online_status:
                 return False
         try:
-            req = _get_requests()
-            if not req:
-                return False
             data = {
                 "player_id": self.player_id,
                 "name": profile_name,
                 "tag": tag,
                 "stats": stats
             }
-            response = req.post(f"{SERVER_URL}/update_profile", json=data)
-            return response.status_code == 200
+            response = self._request('POST', '/update_profile', json=data)
+            return response is not None and response.status_code == 200
         except:
             return False
             
@@ -688,11 +1087,8 @@ class OnlineManager:
         if self.offline_mode:
             return {"message": "Offline mode - Rankings unavailable"}
         try:
-            req = _get_requests()
-            if not req:
-                return []
-            response = req.get(f"{SERVER_URL}/rankings/{timeframe}")
-            if response.status_code == 200:
+            response = self._request('GET', f"/rankings/{timeframe}")
+            if response is not None and response.status_code == 200:
                 return response.json()
         except Exception:
             return []
@@ -709,31 +1105,14 @@ class OnlineManager:
             "target_tag": target_tag,
             "timestamp": datetime.datetime.now().isoformat()
         }
-        req = _get_requests()
-        if not req:
-            return False
-        response = req.post(f"{SERVER_URL}/challenge", json=data)
-        return response.status_code == 200
+        response = self._request('POST', '/challenge', json=data)
+        return response is not None and response.status_code == 200
     
     def check_challenges(self):
         """Check for incoming challenges"""
         try:
-            req = _get_requests()
-            if not req:
-                return []
-            response = req.get(f"{SERVER_URL}/challenges/{self.player_id}")
-            if response.status_code == 200:
-                self.active_challenges = response.json()
-                return self.active_challenges
-        except Exception as e:
-            logging.error(f"Error checking challenges: {e}")
-        return []
-        
-    def check_challenges(self):
-        """Check for incoming challenges"""
-        try:
-            response = requests.get(f"{SERVER_URL}/challenges/{self.player_id}")
-            if response.status_code == 200:
+            response = self._request('GET', f"/challenges/{self.player_id}")
+            if response is not None and response.status_code == 200:
                 self.active_challenges = response.json()
                 return self.active_challenges
         except Exception as e:
@@ -742,25 +1121,24 @@ class OnlineManager:
     
     def start_sync(self):
         """Start automatic profile syncing"""
-        if not self.sync_timer and not self.offline_mode:
-            self._sync_profiles()  # Initial sync
-            self.sync_timer = threading.Timer(SYNC_INTERVAL, self._periodic_sync)
-            self.sync_timer.daemon = True
-            self.sync_timer.start()
+        if not self._sync_thread and not self.offline_mode:
+            self.submit(self._sync_profiles)  # Initial sync, off the UI thread
+            # One long-lived thread instead of a new Timer thread per cycle
+            self._sync_stop = threading.Event()
+            self._sync_thread = threading.Thread(target=self._sync_loop,
+                                                 args=(self._sync_stop,), daemon=True)
+            self._sync_thread.start()
     
     def stop_sync(self):
         """Stop automatic profile syncing"""
-        if self.sync_timer:
-            self.sync_timer.cancel()
-            self.sync_timer = None
-    
-    def _periodic_sync(self):
-        """Internal method for periodic sync"""
-        self._sync_profiles()
-        # Schedule next sync
-        self.sync_timer = threading.Timer(SYNC_INTERVAL, self._periodic_sync)
-        self.sync_timer.daemon = True
-        self.sync_timer.start()
+        if self._sync_thread:
+            self._sync_stop.set()  # wakes the loop so it exits right away
+            self._sync_thread = None
+    
+    def _sync_loop(self, stop):
+        """Sync every SYNC_INTERVAL seconds until stop is set"""
+        while not stop.wait(SYNC_INTERVAL):
+            self._sync_profiles()
     
     def _sync_profiles(self):
         """Sync profiles with the server"""
@@ -768,8 +1146,8 @@ class OnlineManager:
             return
         
         try:
-            # Load local profiles
-            local_profiles = load_profiles()
+            # Work on a copy so the UI can keep saving while we talk to the server
+            local_profiles = profile_mgr.snapshot()
             
             # Get last sync timestamp
             last_sync = self._get_last_sync()
@@ -782,19 +1160,15 @@ class OnlineManager:
                 "last_sync": last_sync
             }
             
-            req = _get_requests()
-            if not req:
-                return
-            response = req.post(f"{SERVER_URL}/sync", json=sync_data)
-            if response.status_code == 200:
+            response = self._request('POST', '/sync', json=sync_data)
+            if response is not None and response.status_code == 200:
                 server_data = response.json()
                 
                 # Merge server profiles with local profiles
                 merged_profiles = self._merge_profiles(local_profiles, server_data.get("profiles", {}))
                 
-                # Save merged profiles
-                with open('math_blast_profiles.json', 'w') as f:
-                    json.dump(merged_profiles, f)
+                # Save merged profiles (skips anything edited/deleted during the request)
+                profile_mgr.merge_in(merged_profiles, local_profiles)
                 
                 # Update last sync timestamp
                 self._save_last_sync(server_data.get("sync_timestamp"))
@@ -809,265 +1183,447 @@ class OnlineManager:
     def _get_last_sync(self):
         """Get the timestamp of the last successful sync"""
         try:
-            with open('sync_info.json', 'r') as f:
-                sync_info = json.load(f)
+            last_sync = profile_mgr.get_meta(LAST_SYNC_KEY)
+            if last_sync is not None:
+                return last_sync
+        except sqlite3.Error as e:
+            logging.error(f"Error reading last sync timestamp: {e}")
+            return None
+        # Older versions kept it in sync_info.json
+        try:
+            with open('sync_info.json', 'rb') as f:
+                sync_info = _json_loads(f.read())
                 return sync_info.get(LAST_SYNC_KEY)
-        except:
+        except (FileNotFoundError, ValueError):  # never synced / corrupt file
             return None
     
     def _save_last_sync(self, timestamp):
         """Save the timestamp of the last successful sync"""
         try:
-            sync_info = {}
-            try:
-                with open('sync_info.json', 'r') as f:
-                    sync_info = json.load(f)
-            except:
-                pass
-            
-            sync_info[LAST_SYNC_KEY] = timestamp
-            
-            with open('sync_info.json', 'w') as f:
-                json.dump(sync_info, f)
-        except Exception as e:
+            profile_mgr.set_meta(LAST_SYNC_KEY, timestamp)
+        except sqlite3.Error as e:
             logging.error(f"Error saving last sync timestamp: {e}")
     
     def _merge_profiles(self, local_profiles, server_profiles):
-        """Merge local and server profiles, keeping the most recent data"""
-        merged = local_profiles.copy()
+        """Merge local and server profiles, keeping the most recent data.
+
+        Only returns the profiles that changed (server was newer or a merge happened).
+        """
+        changed = {}
         
         for name, server_profile in server_profiles.items():
-            if name not in merged:
+            local_profile = local_profiles.get(name)
+            if local_profile is None:
                 # New profile from server
-                merged[name] = server_profile
+                changed[name] = server_profile
             else:
                 # Profile exists locally, merge data
-                local_profile = merged[name]
                 server_timestamp = server_profile.get('last_modified', 0)
                 local_timestamp = local_profile.get('last_modified', 0)
                 
                 if server_timestamp > local_timestamp:
                     # Server has newer data
-                    merged[name] = server_profile
+                    changed[name] = server_profile
                 elif server_timestamp == local_timestamp:
                     # Same timestamp, merge achievements and stats
-                    merged[name]['achievements'] = list(set(
-                        local_profile.get('achievements', []) +
-                        server_profile.get('achievements', [])
-                    ))
+                    merged = dict(local_profile)
+                    achievements = set(local_profile.get('achievements', ()))
+                    achievements.update(server_profile.get('achievements', ()))
+                    merged['achievements'] = list(achievements)
+                    merged.pop('ach_mask', None)  # re-derived from the list on next save
                     
                     # Take highest values for numerical stats
-                    for key in ['highest_level', 'total_correct', 'games_played', 'games_won']:
-                        merged[name][key] = max(
-                            local_profile.get(key, 0),
-                            server_profile.get(key, 0)
-                        )
+                    for key in MERGE_NUMERIC_KEYS:
+                        a = local_profile.get(key, 0)
+                        b = server_profile.get(key, 0)
+                        merged[key] = a if a > b else b
+                    
+                    if merged != local_profile:
+                        changed[name] = merged
         
-        return merged
+        return changed
 
 # Initialize online manager
 online_mgr = OnlineManager()
 
 # Profile and high score functions
-def load_profiles():
-    try:
-        if os.path.exists('math_blast_profiles.json'):
-            with open('math_blast_profiles.json', 'r') as f:
-                return json.load(f)
-    except:
-        pass
-    return {}
+_INF = float('inf')  # "no time recorded yet" for fastest_level
+
+def _account_level(profile):
+    """Account level shown next to the name: one level per 100 xp"""
+    return (profile.get('xp') or 0) // 100 + 1
+
+# One bit per achievement id, persisted as profile['ach_mask']
+ACH_BEGINNER = 1 << 0
+ACH_PERFECT_10 = 1 << 1
+ACH_LEVEL_MASTER = 1 << 2
+ACH_CHALLENGE_KING = 1 << 3
+ACH_MATH_WIZARD = 1 << 4
+ACH_NO_MISTAKE = 1 << 5
+ACHIEVEMENT_BITS = (
+    ('beginner', ACH_BEGINNER),
+    ('perfect_10', ACH_PERFECT_10),
+    ('level_master', ACH_LEVEL_MASTER),
+    ('challenge_king', ACH_CHALLENGE_KING),
+    ('math_wizard', ACH_MATH_WIZARD),
+    ('no_mistake', ACH_NO_MISTAKE),
+)
 
 def check_achievements(profile):
     """Check and award achievements based on profile stats"""
     achievements = profile.get('achievements', [])
     stats = profile.get('stats', {})
+    mask = profile.get('ach_mask')
+    if mask is None:  # older profile, derive the mask from the list once
+        mask = 0
+        for ach_id, bit in ACHIEVEMENT_BITS:
+            if ach_id in achievements:
+                mask |= bit
     
     # Check each achievement condition
-    if 'beginner' not in achievements and stats.get('games_played', 0) > 0:
-        achievements.append('beginner')
-        
-    if 'perfect_10' not in achievements and stats.get('max_streak', 0) >= 10:
-        achievements.append('perfect_10')
-        
-    if 'level_master' not in achievements and profile['highest_level'] >= 5:
-        achievements.append('level_master')
-        
-    if 'challenge_king' not in achievements and stats.get('challenges_won', 0) >= 5:
-        achievements.append('challenge_king')
-        
-    if 'math_wizard' not in achievements and profile['total_correct'] >= 100:
-        achievements.append('math_wizard')
-        
-    if 'no_mistake' not in achievements and stats.get('perfect_levels', 0) > 0:
-        achievements.append('no_mistake')
-        
+    new = 0
+    if not mask & ACH_BEGINNER and stats.get('games_played', 0) > 0:
+        new |= ACH_BEGINNER
+    if not mask & ACH_PERFECT_10 and stats.get('max_streak', 0) >= 10:
+        new |= ACH_PERFECT_10
+    if not mask & ACH_LEVEL_MASTER and profile['highest_level'] >= 5:
+        new |= ACH_LEVEL_MASTER
+    if not mask & ACH_CHALLENGE_KING and stats.get('challenges_won', 0) >= 5:
+        new |= ACH_CHALLENGE_KING
+    if not mask & ACH_MATH_WIZARD and profile['total_correct'] >= 100:
+        new |= ACH_MATH_WIZARD
+    if not mask & ACH_NO_MISTAKE and stats.get('perfect_levels', 0) > 0:
+        new |= ACH_NO_MISTAKE
+
+    # The id list is still what the achievements screen reads; build a new
+    # list rather than extending one a sync snapshot may be holding
+    if new:
+        achievements = achievements + [ach_id for ach_id, bit in ACHIEVEMENT_BITS if new & bit]
+    profile['ach_mask'] = mask | new
     return achievements
 
-def save_profile(name, highest_level, total_correct, game_result=None, game_stats=None):
-    profiles = load_profiles()
-    if name in profiles:
-        # Update existing profile with highest values and stats
-        profile = profiles[name]
-        profile['highest_level'] = max(highest_level, profile['highest_level'])
-        profile['total_correct'] = total_correct + profile.get('total_correct', 0)
-        profile['games_played'] = profile.get('games_played', 0) + (1 if game_result else 0)
-        profile['last_modified'] = int(datetime.datetime.now().timestamp())
-        
-        # Update game stats
-        if game_result:
-            profile['games_won'] = profile.get('games_won', 0) + (1 if game_result == 'win' else 0)
-            profile['games_lost'] = profile.get('games_lost', 0) + (1 if game_result == 'lose' else 0)
-        
-        # Update detailed stats
-        if game_stats:
-            stats = profile.get('stats', {})
-            stats['max_streak'] = max(stats.get('max_streak', 0), game_stats.get('streak', 0))
-            stats['perfect_levels'] = stats.get('perfect_levels', 0) + (1 if game_stats.get('no_mistakes', False) else 0)
-            stats['fastest_level'] = min(stats.get('fastest_level', float('inf')), game_stats.get('level_time', float('inf')))
-            stats['total_time'] = stats.get('total_time', 0) + game_stats.get('total_time', 0)
-            profile['stats'] = stats
-        
-        # Check and award achievements
-        profile['achievements'] = check_achievements(profile)
-    else:
-        # Create new profile with default values
-        profiles[name] = {
-            'highest_level': highest_level,
-            'total_correct': total_correct,
-            'games_played': 0,
-            'games_won': 0,
-            'games_lost': 0,
-            'avatar': random.choice(AVATARS)  # assign random avatar
-        }
-    with open('math_blast_profiles.json', 'w') as f:
-        json.dump(profiles, f)
-    # After saving locally, attempt to push update to server in background
-    try:
-        profile = profiles.get(name, {})
-        tag = profile.get('tag', '')
-        stats = {
-            'highest_level': profile.get('highest_level', highest_level),
-            'total_correct': profile.get('total_correct', total_correct),
-            'games_played': profile.get('games_played', 0),
-            'games_won': profile.get('games_won', 0)
-        }
-        # Fire-and-forget background update so UI isn't blocked
-        if 'online_mgr' in globals():
-            try:
-                threading.Thread(target=online_mgr.update_profile, args=(name, tag, stats), daemon=True).start()
-            except Exception:
-                pass
-    except Exception:
-        pass
-
-def delete_profile(name):
-    profiles = load_profiles()
-    if name in profiles:
-        del profiles[name]
-        with open('math_blast_profiles.json', 'w') as f:
-            json.dump(profiles, f)
-        return True
-    return False
+PROFILE_DB = 'math_blast_profiles.db'
+PROFILE_FLUSH_DELAY = 0.5  # seconds to coalesce profile saves
 
-def get_leaderboard():
-    """Get sorted leaderboard data"""
-    profiles = load_profiles()
-    # Sort by highest level first, then total correct
-    return sorted(
-        [(name, data) for name, data in profiles.items()],
-        key=lambda x: (x[1]['highest_level'], x[1]['total_correct']),
-        reverse=True
-    )
-
-
-# Profile manager to centralize profile I/O and merging logic
+# Profile manager to centralize profile I/O and merging logic.
+# Profiles are stored one row per profile in SQLite (WAL mode) so a save or
+# delete only touches that row; the in-memory dict is the working copy.
 class ProfileManager:
-    def __init__(self, filename='math_blast_profiles.json'):
-        self.filename = filename
+    def __init__(self, filename='math_blast_profiles.json', db_path=PROFILE_DB):
+        self.filename = filename  # old JSON store, imported once if the db is empty
+        self.db_path = db_path
+        self._db = None
+        self._cache = None
+        self._dirty = set()  # names to write on the next flush
+        self._deleted = set()  # names to remove on the next flush
+        self._flush_timer = None
+        self._lock = threading.RLock()
+        # Leaderboard index: sorted (-level, -correct, name) keys, built on first use
+        self._board = None
+        self._board_keys = {}  # name -> its key in self._board
+        # Player tags in use, built on first use
+        self._tags = None
+        self._tag_of = {}  # name -> tag counted in self._tags
+
+    def _connect(self):
+        if self._db is None:
+            # Flushes run on a timer thread, access is serialized by self._lock
+            db = sqlite3.connect(self.db_path, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute('CREATE TABLE IF NOT EXISTS profiles (name TEXT PRIMARY KEY, data BLOB NOT NULL)')
+            db.execute('CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT)')
+            self._db = db
+        return self._db
 
     def load_profiles(self):
-        try:
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r') as f:
-                    return json.load(f)
-        except Exception as e:
-            logging.error(f"Error loading profiles: {e}")
-        return {}
+        """Return profiles, reading the database only the first time.
+
+        Every save goes through this same dict, so callers on hot paths
+        (update_status, show_main_menu, ...) can call it freely.
+        """
+        if self._cache is None:
+            try:
+                db = self._connect()
+                rows = db.execute('SELECT name, data FROM profiles')
+                self._cache = {name: _json_loads(data) for name, data in rows}
+                # user_version marks that the old JSON file was already checked,
+                # so deleting every profile doesn't bring the old ones back
+                if db.execute('PRAGMA user_version').fetchone()[0] == 0:
+                    imported = {} if self._cache else self._import_json()
+                    # Write the imported rows and the marker in one transaction,
+                    # so a crash can't mark the import done without its rows
+                    with db:
+                        db.execute('BEGIN')
+                        db.executemany('INSERT OR REPLACE INTO profiles VALUES (?, ?)',
+                                       [(name, _json_dumps(data)) for name, data in imported.items()])
+                        db.execute('PRAGMA user_version = 1')
+                    if imported:
+                        self._cache = imported
+                for profile in self._cache.values():
+                    if 'account_level' not in profile:  # saved before it was stored
+                        profile['account_level'] = _account_level(profile)
+            except Exception as e:
+                logging.error(f"Error loading profiles: {e}")
+                self._cache = {}
+        return self._cache
 
-    def save_profiles(self, profiles):
+    def _import_json(self):
+        """Read profiles from the old JSON file, to be carried over into the db"""
         try:
-            with open(self.filename, 'w') as f:
-                json.dump(profiles, f)
-        except Exception as e:
-            logging.error(f"Error saving profiles: {e}")
+            with open(self.filename, 'rb') as f:
+                profiles = _json_loads(f.read())
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            logging.error(f"Ignoring unreadable {self.filename}: {e}")
+            return {}
+        if profiles:
+            logging.info(f"Importing {len(profiles)} profiles from {self.filename}")
+        return profiles or {}
+
+    def get_meta(self, key):
+        """Read a small persisted setting (e.g. the last sync time)"""
+        with self._lock:
+            row = self._connect().execute('SELECT v FROM meta WHERE k = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self._lock:
+            db = self._connect()
+            with db:
+                db.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, value))
+
+    def snapshot(self):
+        """Copy of all profiles that is safe to use from another thread"""
+        profiles = self.load_profiles()
+        with self._lock:
+            return {name: dict(data) for name, data in profiles.items()}
+
+    def merge_in(self, profiles, base):
+        """Apply synced profiles on top of the current ones.
+
+        base is the snapshot() the sync started from; profiles saved, created
+        or deleted locally since then are left alone.
+        """
+        current = self.load_profiles()
+        with self._lock:
+            applied = []
+            for name, profile in profiles.items():
+                if name in self._deleted:
+                    continue  # deleted locally, not flushed yet
+                if name in base:
+                    if current.get(name) != base[name]:
+                        continue  # saved or deleted during the sync
+                elif name in current:
+                    continue  # created locally during the sync
+                current[name] = profile
+                applied.append(name)
+            if not applied:
+                return
+            self._dirty.update(applied)
+            self._board = None  # rebuilt on next get_leaderboard
+            self._tags = None
+        self._schedule_flush()
+
+    def mark_changed(self, name):
+        """Queue one profile row to be written"""
+        with self._lock:
+            self._dirty.add(name)
+            self._deleted.discard(name)
+            self._board_update(name)
+            self._tags_update(name)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Write pending changes shortly after, off the UI thread"""
+        with self._lock:
+            # Restart the timer so a burst of saves becomes one transaction
+            if self._flush_timer:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(PROFILE_FLUSH_DELAY, self._flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush(self):
+        with self._lock:
+            if not self._dirty and not self._deleted:
+                return
+            rows = [(name, _json_dumps(self._cache[name])) for name in self._dirty if name in self._cache]
+            deleted = [(name,) for name in self._deleted]
+            try:
+                db = self._connect()
+                with db:  # one transaction
+                    db.executemany('INSERT OR REPLACE INTO profiles VALUES (?, ?)', rows)
+                    db.executemany('DELETE FROM profiles WHERE name = ?', deleted)
+                self._dirty.clear()
+                self._deleted.clear()
+            except Exception as e:
+                # Keep the pending changes and try again later
+                logging.error(f"Error saving profiles: {e}")
+                self._schedule_flush()
+
+    def flush(self):
+        """Write any pending profile changes now"""
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        self._flush()
 
     def save_profile(self, name, highest_level, total_correct, game_result=None, game_stats=None):
-        profiles = self.load_profiles()
-        if name in profiles:
+        # Hold the lock while editing so a flush or sync snapshot never
+        # sees a half-updated profile
+        with self._lock:
+            profiles = self.load_profiles()
+            if name in profiles:
+                profile = profiles[name]
+                profile['highest_level'] = max(highest_level, profile.get('highest_level', 1))
+                profile['total_correct'] = total_correct + profile.get('total_correct', 0)
+                profile['games_played'] = profile.get('games_played', 0) + (1 if game_result else 0)
+                profile['last_modified'] = int(time.time())
+
+                if game_result:
+                    profile['games_won'] = profile.get('games_won', 0) + (1 if game_result == 'win' else 0)
+                    profile['games_lost'] = profile.get('games_lost', 0) + (1 if game_result == 'lose' else 0)
+
+                if game_stats:
+                    stats = dict(profile.get('stats', {}))  # fresh copy, snapshots keep the old one
+                    stats['max_streak'] = max(stats.get('max_streak', 0), game_stats.streak)
+                    stats['perfect_levels'] = stats.get('perfect_levels', 0) + (1 if game_stats.no_mistakes else 0)
+                    # orjson stores a missing time (inf) as null, so treat None as "no time yet"
+                    fastest = stats.get('fastest_level')
+                    fastest = _INF if fastest is None else fastest
+                    stats['fastest_level'] = min(fastest, game_stats.level_time)
+                    stats['total_time'] = stats.get('total_time', 0) + game_stats.total_time
+                    profile['stats'] = stats
+
+                profile['achievements'] = check_achievements(profile)
+            else:
+                profiles[name] = {
+                    'highest_level': highest_level,
+                    'total_correct': total_correct,
+                    'games_played': 0,
+                    'games_won': 0,
+                    'games_lost': 0,
+                    'avatar': random.choice(AVATARS)
+                }
+
+            # Stored so the profile/leaderboard lists don't recompute it per row
+            profiles[name]['account_level'] = _account_level(profiles[name])
+            self.mark_changed(name)
+        # After saving locally, push the update to the server in background
+        if 'online_mgr' in globals():
             profile = profiles[name]
-            profile['highest_level'] = max(highest_level, profile.get('highest_level', 1))
-            profile['total_correct'] = total_correct + profile.get('total_correct', 0)
-            profile['games_played'] = profile.get('games_played', 0) + (1 if game_result else 0)
-            profile['last_modified'] = int(datetime.datetime.now().timestamp())
-
-            if game_result:
-                profile['games_won'] = profile.get('games_won', 0) + (1 if game_result == 'win' else 0)
-                profile['games_lost'] = profile.get('games_lost', 0) + (1 if game_result == 'lose' else 0)
-
-            if game_stats:
-                stats = profile.get('stats', {})
-                stats['max_streak'] = max(stats.get('max_streak', 0), game_stats.get('streak', 0))
-                stats['perfect_levels'] = stats.get('perfect_levels', 0) + (1 if game_stats.get('no_mistakes', False) else 0)
-                stats['fastest_level'] = min(stats.get('fastest_level', float('inf')), game_stats.get('level_time', float('inf')))
-                stats['total_time'] = stats.get('total_time', 0) + game_stats.get('total_time', 0)
-                profile['stats'] = stats
-
-            profile['achievements'] = check_achievements(profile)
-        else:
-            profiles[name] = {
-                'highest_level': highest_level,
-                'total_correct': total_correct,
-                'games_played': 0,
-                'games_won': 0,
-                'games_lost': 0,
-                'avatar': random.choice(AVATARS)
+            stats = {
+                'highest_level': profile.get('highest_level', highest_level),
+                'total_correct': profile.get('total_correct', total_correct),
+                'games_played': profile.get('games_played', 0),
+                'games_won': profile.get('games_won', 0)
             }
+            online_mgr.queue_profile_update(name, profile.get('tag', ''), stats)
 
-        self.save_profiles(profiles)
+    def create_profile(self, name, avatar, tag):
+        """Add a new profile with its avatar and tag in one save"""
+        profiles = self.load_profiles()
+        profiles[name] = {
+            'highest_level': 1,
+            'total_correct': 0,
+            'games_played': 0,
+            'games_won': 0,
+            'games_lost': 0,
+            'avatar': avatar,
+            'tag': tag,
+            'account_level': 1
+        }
+        self.mark_changed(name)
+        return profiles[name]
 
     def delete_profile(self, name):
         profiles = self.load_profiles()
         if name in profiles:
             del profiles[name]
-            self.save_profiles(profiles)
+            with self._lock:
+                self._dirty.discard(name)
+                self._deleted.add(name)
+                self._board_update(name)
+                self._tags_update(name)
+            self._schedule_flush()
             return True
         return False
 
-    def get_leaderboard(self):
+    def _board_update(self, name):
+        """Move one profile to its new place in the leaderboard index"""
+        if self._board is None:
+            return
+        old = self._board_keys.pop(name, None)
+        if old is not None:
+            del self._board[bisect.bisect_left(self._board, old)]
+        data = self._cache.get(name)
+        if data is not None:
+            key = (-data.get('highest_level', 1), -data.get('total_correct', 0), name)
+            bisect.insort(self._board, key)
+            self._board_keys[name] = key
+
+    def _tags_update(self, name):
+        if self._tags is None:
+            return
+        old = self._tag_of.pop(name, None)
+        if old:
+            self._tags.discard(old)
+        tag = self._cache.get(name, {}).get('tag')
+        if tag:
+            self._tags.add(tag)
+            self._tag_of[name] = tag
+
+    def used_tags(self):
+        """Set of player tags already taken"""
         profiles = self.load_profiles()
-        return sorted(
-            [(name, data) for name, data in profiles.items()],
-            key=lambda x: (x[1].get('highest_level', 1), x[1].get('total_correct', 0)),
-            reverse=True
-        )
+        with self._lock:
+            if self._tags is None:
+                self._tag_of = {name: p.get('tag') for name, p in profiles.items()
+                                if isinstance(p, dict) and p.get('tag')}
+                self._tags = set(self._tag_of.values())
+            return self._tags
+
+    def get_leaderboard(self, limit=None):
+        """Profiles ordered by highest level, then total correct"""
+        profiles = self.load_profiles()
+        with self._lock:
+            if self._board is None:
+                self._board_keys = {
+                    name: (-data.get('highest_level', 1), -data.get('total_correct', 0), name)
+                    for name, data in profiles.items()
+                }
+                self._board = sorted(self._board_keys.values())
+            top = self._board if limit is None else self._board[:limit]
+            return [(key[2], profiles[key[2]]) for key in top]
 
 # instantiate manager
 profile_mgr = ProfileManager()
+atexit.register(profile_mgr.flush)
+
+# Module-level names used throughout the UI code
+load_profiles = profile_mgr.load_profiles
+save_profile = profile_mgr.save_profile
+delete_profile = profile_mgr.delete_profile
+get_leaderboard = profile_mgr.get_leaderboard
+
+# Valid player tag: 1-16 letters, digits, '-' or '_'
+_TAG_RE = re.compile(r'^[A-Za-z0-9_-]{1,16}\Z')
 
-def generate_unique_tag(existing_profiles_func=None, prefix='P'):
+def generate_unique_tag(existing_profiles_func=None, prefix='P', used=None):
     """Generate a short unique player tag not present in existing profiles.
 
     existing_profiles_func: optional callable returning dict of profiles (name->data).
     prefix: short prefix string for readability.
+    used: optional set of taken tags; defaults to profile_mgr's tag index.
     """
-    existing = {}
     try:
-        if existing_profiles_func:
+        if used is None and existing_profiles_func:
             existing = existing_profiles_func()
-        else:
-            existing = load_profiles()
-        used = {p.get('tag') for p in existing.values() if isinstance(p, dict) and p.get('tag')}
+            used = {p.get('tag') for p in existing.values() if isinstance(p, dict) and p.get('tag')}
+        elif used is None:
+            used = profile_mgr.used_tags()
     except Exception:
         used = set()
 
@@ -1077,10 +1633,10 @@ def generate_unique_tag(existing_profiles_func=None, prefix='P'):
         if tag not in used:
             return tag
 
-    # fallback to uuid-based short tag
-    t = uuid.uuid4().hex[:8].upper()
+    # fallback to a random 8-hex-digit tag
+    t = secrets.token_hex(4).upper()
     while t in used:
-        t = uuid.uuid4().hex[:8].upper()
+        t = secrets.token_hex(4).upper()
     return t
 
 def create_profile_screen():
@@ -1181,8 +1737,7 @@ def create_profile_screen():
     def check_tag_availability(event=None):
         try:
             entered = new_tag.get().strip()
-            profiles = load_profiles()
-            used = {p.get('tag') for p in profiles.values() if isinstance(p, dict) and p.get('tag')}
+            used = profile_mgr.used_tags()
             if not entered:
                 tag_status.config(text="No tag", fg='orange')
                 return False
@@ -1190,7 +1745,7 @@ def create_profile_screen():
                 tag_status.config(text="Taken", fg='red')
                 return False
             # basic validation: alnum and limited length
-            if len(entered) > 16 or not all(c.isalnum() or c in ('-', '_') for c in entered):
+            if not _TAG_RE.match(entered):
                 tag_status.config(text="Invalid", fg='red')
                 return False
             tag_status.config(text="Available", fg='green')
@@ -1274,13 +1829,7 @@ def create_profile_screen():
                 tk.messagebox.showerror("Error", "Tag is invalid or already taken")
                 return
 
-            # create the profile then set avatar and tag
-            save_profile(name, 1, 0)
-            profiles = load_profiles()  # reload to get saved profile
-            profiles[name]['avatar'] = selected_avatar.get()  # Save chosen avatar
-            profiles[name]['tag'] = tag
-            with open('math_blast_profiles.json', 'w') as f:
-                json.dump(profiles, f)
+            profile_mgr.create_profile(name, selected_avatar.get(), tag)
             new_name.delete(0, tk.END)
             update_profile_list()
             update_leaderboard()
@@ -1318,15 +1867,23 @@ def create_profile_screen():
     profile_tree.column('games', width=100, anchor='center')
     profile_tree.pack(pady=10, fill="both", expand=True)
     
+    # What each tree currently shows, so refreshes only touch rows that changed
+    profile_rows = {}  # profile name -> (text, values)
+    leader_rows = []  # values per leaderboard rank
+    PLACEHOLDER = '__placeholder__'
+
     def update_profile_list():
         try:
-            # clear tree
-            for iid in profile_tree.get_children():
-                profile_tree.delete(iid)
             profiles = load_profiles()
+            if profile_tree.exists(PLACEHOLDER):
+                profile_tree.delete(PLACEHOLDER)
+            # Drop rows for deleted profiles
+            for name in [n for n in profile_rows if n not in profiles]:
+                profile_tree.delete(name)
+                del profile_rows[name]
             
             if not profiles:
-                profile_tree.insert('', 'end', text='No profiles yet - Create one!', values=('', '', '', ''))
+                profile_tree.insert('', 'end', iid=PLACEHOLDER, text='No profiles yet - Create one!', values=('', '', '', ''))
                 return
                 
             for name in profiles:
@@ -1337,9 +1894,17 @@ def create_profile_screen():
                     score_val = profile.get('total_correct', 0)
                     games = profile.get('games_played', 0)
                     tag = profile.get('tag', '')
-                    acct_lvl = profile.get('account_level', profile.get('xp', 0) // 100 + 1 if profile.get('xp') is not None else 1)
-                    # Use profile name as item id (iids must be unique)
-                    profile_tree.insert('', 'end', iid=name, text=f"{avatar} {name}", values=(tag, acct_lvl, lvl, score_val, games))
+                    acct_lvl = profile.get('account_level', 1)
+                    row = (f"{avatar} {name}", (tag, acct_lvl, lvl, score_val, games))
+                    old = profile_rows.get(name)
+                    if old == row:
+                        continue
+                    if old is None:
+                        # Use profile name as item id (iids must be unique)
+                        profile_tree.insert('', 'end', iid=name, text=row[0], values=row[1])
+                    else:
+                        profile_tree.item(name, text=row[0], values=row[1])
+                    profile_rows[name] = row
                 except Exception as e:
                     logging.error(f"Error formatting profile {name}: {e}")
                     continue
@@ -1349,26 +1914,16 @@ def create_profile_screen():
             try:
                 for iid in profile_tree.get_children():
                     profile_tree.delete(iid)
-                profile_tree.insert('', 'end', text='Error loading profiles', values=('', '', '', ''))
+                profile_rows.clear()
+                profile_tree.insert('', 'end', iid=PLACEHOLDER, text='Error loading profiles', values=('', '', '', ''))
             except Exception:
                 pass
             
     def update_leaderboard():
             try:
-                # populate leaderboard_tree
-                try:
-                    for iid in leaderboard_tree.get_children():
-                        leaderboard_tree.delete(iid)
-                except Exception:
-                    pass
-
-                all_leaders = get_leaderboard()
-                leaders = all_leaders[:5] if all_leaders else []
-
-                if not leaders:
-                    leaderboard_tree.insert('', 'end', values=('No scores yet', '', '', ''))
-                    return
+                leaders = get_leaderboard(5)
 
+                rows = []
                 medals = ["🥇", "🥈", "🥉"]
                 for i, (name, data) in enumerate(leaders, 1):
                     try:
@@ -1378,14 +1933,28 @@ def create_profile_screen():
                         games = data.get('games_played', 0)
                         wins = data.get('games_won', 0)
                         win_rate = (wins / games * 100) if games > 0 else 0
-                        acct_lvl = data.get('account_level', data.get('xp', 0) // 100 + 1 if data.get('xp') is not None else 1)
+                        acct_lvl = data.get('account_level', 1)
                         display_name = f"{medals[i-1] if i<=3 else '  '} {avatar} {name}"
                         # include account level in the name column for visibility
                         display_name = f"{display_name} [Lvl {acct_lvl}]"
-                        leaderboard_tree.insert('', 'end', values=(display_name, level, score_val, f"{win_rate:.1f}%"))
+                        rows.append((display_name, level, score_val, f"{win_rate:.1f}%"))
                     except Exception as e:
                         logging.error(f"Error formatting leaderboard entry: {e}")
                         continue
+                if not rows:
+                    rows.append(('No scores yet', '', '', ''))
+
+                # Rows are keyed by rank; only rewrite ranks whose contents changed
+                for i, values in enumerate(rows):
+                    if i >= len(leader_rows):
+                        leaderboard_tree.insert('', 'end', iid=f"rank{i}", values=values)
+                        leader_rows.append(values)
+                    elif leader_rows[i] != values:
+                        leaderboard_tree.item(f"rank{i}", values=values)
+                        leader_rows[i] = values
+                while len(leader_rows) > len(rows):
+                    leader_rows.pop()
+                    leaderboard_tree.delete(f"rank{len(leader_rows)}")
             except Exception as e:
                 logging.error(f"Unable to load leaderboard data: {e}")
     
@@ -1515,50 +2084,49 @@ def create_profile_screen():
         except Exception:
             pass
 
-        # Start profile syncing if online
+        # Start profile syncing if online (start_sync already hands the
+        # first sync to the background worker)
         if online_mgr.online_status:
             online_mgr.start_sync()
 
-        # Start analytics session
-        analytics.start_session(name)
+        # Start analytics session on its own thread (it writes the sessions log),
+        # not the online worker, where it would wait behind the first sync
+        threading.Thread(target=analytics.start_session, args=(name,), daemon=True).start()
 
         # Create progress tracker for the profile
         global current_progress_tracker
+        if current_progress_tracker:
+            current_progress_tracker.flush()  # don't drop the old profile's batch
         current_progress_tracker = ProgressTracker(name)
         current_progress_tracker.load_progress()
 
         # Reset game stats
-        global game_stats
-        game_stats = {
-            'streak': 0,
-            'max_streak': 0,
-            'current_problem': None,
-            'problem_success_rate': {
-                '+': 1.0,
-                '-': 1.0,
-                '*': 1.0,
-                '/': 1.0
-            },
-            'problems_by_type': {
-                'addition': 0,
-                'subtraction': 0,
-                'multiplication': 0,
-                'division': 0
-            },
-            'no_mistakes': True,
-            'level_start_time': datetime.datetime.now(),
-            'total_time': 0
-        }
+        game_stats.reset()
 
         profile_window.destroy()
-        show_main_menu()
+        # Let Tk finish tearing the window down, then redraw the menu in one pass
+        root.after_idle(show_main_menu)
+
+PROGRESS_FLUSH_EVERY = 20  # updates between progress file writes
+PROGRESS_FLUSH_MS = 5000  # ...or write this long after the first pending one
+LEARNING_CURVE_MAX = 1000  # learning curve entries kept per profile
+
+def _curve_entry(entry):
+    """(timestamp, problem_type, success, time_taken, skill_level) for a saved entry"""
+    if isinstance(entry, dict):  # saved by an older version
+        return (datetime.datetime.fromisoformat(entry['timestamp']).timestamp(), entry['problem_type'],
+                entry['success'], entry['time_taken'], entry['skill_level'])
+    return tuple(entry)
 
 class ProgressTracker:
     def __init__(self, profile_name):
         self.profile_name = profile_name
         self.progress_file = f"progress_{profile_name}.json"
+        self._pending_writes = 0
+        self._flush_job = None
+        self._reco_cache = None  # (problem types, weights) for the current skill levels
         self.progress_data = {
-            'learning_curve': [],  # Track improvement over time
+            'learning_curve': deque(maxlen=LEARNING_CURVE_MAX),  # Track improvement over time
             'problem_history': [],  # Recent problem performance
             'skill_levels': {
                 'addition': 1.0,
@@ -1577,34 +2145,65 @@ class ProgressTracker:
     def load_progress(self):
         try:
             if os.path.exists(self.progress_file):
-                with open(self.progress_file, 'r') as f:
-                    saved_data = json.load(f)
+                with open(self.progress_file, 'rb') as f:
+                    saved_data = _json_loads(f.read())
                     self.progress_data.update(saved_data)
+                    self.progress_data['learning_curve'] = deque(
+                        map(_curve_entry, saved_data.get('learning_curve', [])), maxlen=LEARNING_CURVE_MAX)
+                    self._reco_cache = None
                     
                 # Check daily streak
-                if self.progress_data['daily_goals']['last_played']:
-                    last_played = datetime.datetime.fromisoformat(
-                        self.progress_data['daily_goals']['last_played']
-                    )
-                    today = datetime.datetime.now()
-                    days_diff = (today - last_played).days
+                goals = self.progress_data['daily_goals']
+                now = time.time()
+                last_played_ts = goals.get('last_played_ts')
+                if last_played_ts is None and goals['last_played']:
+                    # Older files only have the ISO string
+                    last_played_ts = datetime.datetime.fromisoformat(goals['last_played']).timestamp()
+                if last_played_ts is not None:
+                    days_diff = int((now - last_played_ts) // 86400)
                     
                     if days_diff > 1:  # Streak broken
-                        self.progress_data['daily_goals']['streak_days'] = 0
+                        goals['streak_days'] = 0
                     elif days_diff == 1:  # Continued streak
-                        self.progress_data['daily_goals']['streak_days'] += 1
+                        goals['streak_days'] += 1
                         
-                # Update last played
-                self.progress_data['daily_goals']['last_played'] = datetime.datetime.now().isoformat()
+                # Update last played (the ISO string is kept for older versions)
+                goals['last_played_ts'] = now
+                goals['last_played'] = datetime.datetime.fromtimestamp(now).isoformat()
                 self.save_progress()
                     
         except Exception as e:
             logging.error(f"Error loading progress for {self.profile_name}: {e}")
     
     def save_progress(self):
+        """Mark progress changed; the file is written in batches"""
+        self._pending_writes += 1
+        if self._pending_writes >= PROGRESS_FLUSH_EVERY:
+            self._save_now()
+        elif self._flush_job is None:
+            self._flush_job = root.after(PROGRESS_FLUSH_MS, self._periodic_flush)
+
+    def _periodic_flush(self):
+        self._flush_job = None
+        self.flush()
+
+    def flush(self):
+        """Write pending progress changes, if any"""
+        if self._pending_writes:
+            self._save_now()
+
+    def _save_now(self):
+        # Write a temp file and swap it in, so a crash never leaves half a file
+        tmp = self.progress_file + '.tmp'
         try:
-            with open(self.progress_file, 'w') as f:
-                json.dump(self.progress_data, f)
+            with open(tmp, 'wb', buffering=65536) as f:
+                # JSON has no deque, store the learning curve as a list
+                data = dict(self.progress_data, learning_curve=list(self.progress_data['learning_curve']))
+                f.write(_json_dumps(data))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.progress_file)
+            self._pending_writes = 0
         except Exception as e:
             logging.error(f"Error saving progress for {self.profile_name}: {e}")
     
@@ -1624,43 +2223,33 @@ class ProgressTracker:
         new_level = max(0.1, min(5.0, current_level + skill_change))
         self.progress_data['skill_levels'][problem_type] = new_level
         
-        # Record in learning curve
-        self.progress_data['learning_curve'].append({
-            'timestamp': datetime.datetime.now().isoformat(),
-            'problem_type': problem_type,
-            'success': success,
-            'time_taken': time_taken,
-            'skill_level': new_level
-        })
-        
-        # Keep learning curve manageable
-        if len(self.progress_data['learning_curve']) > 1000:
-            self.progress_data['learning_curve'] = self.progress_data['learning_curve'][-1000:]
+        # Record in learning curve as (timestamp, problem_type, success, time_taken, skill_level)
+        self.progress_data['learning_curve'].append(
+            (time.time(), problem_type, success, time_taken, new_level))
+        self._reco_cache = None
         
         self.save_progress()
     
     def get_recommended_problem_type(self):
         """Suggest problem type based on skill levels"""
-        skills = self.progress_data['skill_levels']
-        # Favor problems types with lower skill levels
-        weights = {k: 1/v for k, v in skills.items()}
-        total = sum(weights.values())
-        weights = {k: v/total for k, v in weights.items()}
-        
-        return random.choices(
-            list(weights.keys()),
-            weights=list(weights.values())
-        )[0]
+        if self._reco_cache is None:
+            skills = self.progress_data['skill_levels']
+            # Favor problems types with lower skill levels
+            inverse = [1.0 / v for v in skills.values()]
+            total = sum(inverse)
+            self._reco_cache = (list(skills), [v / total for v in inverse])
+        types, weights = self._reco_cache
+        return random.choices(types, weights=weights, k=1)[0]
         
     def check_achievement_progress(self, stats):
         """Update progress towards achievements"""
         achievements_data = self.progress_data['achievements_progress']
         
         # Example achievement checks
-        if stats['streak'] > achievements_data.get('best_streak', 0):
-            achievements_data['best_streak'] = stats['streak']
+        if stats.streak > achievements_data.get('best_streak', 0):
+            achievements_data['best_streak'] = stats.streak
             
-        if stats.get('no_mistakes', False):
+        if stats.no_mistakes:
             achievements_data['perfect_levels'] = achievements_data.get('perfect_levels', 0) + 1
             
         self.save_progress()
@@ -1674,7 +2263,7 @@ def show_main_menu():
         profiles = load_profiles()
         profile = profiles.get(current_profile, {}) if current_profile else {}
         tag = profile.get('tag', '') if isinstance(profile, dict) else ''
-        acct_lvl = profile.get('account_level', profile.get('xp', 0) // 100 + 1 if isinstance(profile, dict) else 1)
+        acct_lvl = profile.get('account_level', 1) if isinstance(profile, dict) else 1
         title = f"Math Blast - Profile: {current_profile}" if current_profile else "Math Blast"
         if tag:
             title = f"{title} [{tag}]"
@@ -1690,7 +2279,6 @@ root.title("Math Blast")
 
 # Initialize managers
 layout_mgr, touch_mgr = init_managers(root)
-root.minsize(layout_mgr.min_width, layout_mgr.min_height)
 
 # Increase touch targets if touch is enabled
 # Ensure a default button_style exists before we attempt to update it.
@@ -1715,26 +2303,42 @@ if touch_mgr.touch_enabled:
 # Initialize current profile and trackers
 current_profile = None
 current_progress_tracker = None
-game_stats = {
-    'streak': 0,
-    'max_streak': 0,
-    'current_problem': None,
-    'problem_success_rate': {
-        '+': 1.0,
-        '-': 1.0,
-        '*': 1.0,
-        '/': 1.0
-    },
-    'problems_by_type': {
-        'addition': 0,
-        'subtraction': 0,
-        'multiplication': 0,
-        'division': 0
-    },
-    'no_mistakes': True,
-    'level_start_time': datetime.datetime.now(),
-    'total_time': 0
-}
+
+def _flush_progress():
+    if current_progress_tracker:
+        current_progress_tracker.flush()
+
+atexit.register(_flush_progress)
+
+@dataclass
+class GameStats:
+    """Stats for the game in progress, reset in place between games"""
+    streak: int = 0
+    max_streak: int = 0
+    current_problem: dict = None
+    problem_success_rate: dict = field(default_factory=lambda: {'+': 1.0, '-': 1.0, '*': 1.0, '/': 1.0})
+    problems_by_type: dict = field(default_factory=lambda: {'addition': 0, 'subtraction': 0, 'multiplication': 0, 'division': 0})
+    no_mistakes: bool = True
+    start_time: datetime.datetime = field(default_factory=cached_now)
+    level_start_mono: float = field(default_factory=time.monotonic)  # for durations only
+    total_time: float = 0
+    level_time: float = 0
+
+    def reset(self):
+        self.streak = 0
+        self.max_streak = 0
+        self.current_problem = None
+        for op in self.problem_success_rate:
+            self.problem_success_rate[op] = 1.0
+        for kind in self.problems_by_type:
+            self.problems_by_type[kind] = 0
+        self.no_mistakes = True
+        self.start_time = cached_now()
+        self.level_start_mono = time.monotonic()
+        self.total_time = 0
+        self.level_time = 0
+
+game_stats = GameStats()
 
 # Theme configuration
 THEME = {
@@ -1762,13 +2366,6 @@ button_style = {
     'pady': 8   # vertical padding
 }
 
-# Configure custom styles for ttk widgets
-style = ttk.Style()
-style.configure('GameProgress.Horizontal.TProgressbar',
-                troughcolor=THEME['background'],
-                background=THEME['secondary'],
-                thickness=25)
-
 # Create and configure the main window
 root.configure(bg=THEME['background'])
 root.option_add('*Font', 'Arial 12')
@@ -1825,15 +2422,11 @@ else:
     profiles = load_profiles()
     if TEST_PROFILE not in profiles:
         # create a lightweight profile
-        save_profile(TEST_PROFILE, 1, 0)
-        profiles = load_profiles()
-        profiles[TEST_PROFILE]['avatar'] = AVATARS[0]
         try:
-            profiles[TEST_PROFILE]['tag'] = generate_unique_tag()
+            test_tag = generate_unique_tag()
         except Exception:
-            profiles[TEST_PROFILE]['tag'] = f"AUT{random.randint(1000,9999)}"
-        with open('math_blast_profiles.json', 'w') as f:
-            json.dump(profiles, f)
+            test_tag = f"AUT{random.randint(1000,9999)}"
+        profile_mgr.create_profile(TEST_PROFILE, AVATARS[0], test_tag)
 
     # Programmatically select the profile and start the game after mainloop starts
     def _auto_start():
@@ -1855,16 +2448,17 @@ else:
                 iteration[0] += 1
                 if iteration[0] > max_iter:
                     return
-                # Read the correct answer from AUT_problem_answer (StringVar)
+                # Read the correct answer from AUT_problem_answer (DoubleVar)
                 aut_ans_var = globals().get('AUT_problem_answer')
+                aut_label = globals().get('AUT_problem_label')
                 aut_entry = globals().get('AUT_answer_entry')
                 aut_btn = globals().get('AUT_submit_btn')
-                if aut_ans_var and aut_entry and aut_btn:
+                if aut_ans_var and aut_label and aut_entry and aut_btn:
                     try:
-                        ans = aut_ans_var.get()
-                        if ans:
+                        # Only answer while a problem is showing (the answer may be 0)
+                        if aut_label.cget('text').endswith('?'):
                             aut_entry.delete(0, tk.END)
-                            aut_entry.insert(0, str(ans))
+                            aut_entry.insert(0, f"{aut_ans_var.get():g}")
                             # Click submit
                             aut_btn.invoke()
                     except Exception:
@@ -1880,6 +2474,58 @@ else:
     # schedule after a short delay so Tk is ready
     root.after(200, _auto_start)
 
+# Beeps block for their whole duration, so they play on a worker thread
+_beep_queue = queue.Queue(maxsize=16)
+_beep_thread = None
+
+def _beep_worker():
+    import winsound  # only imported once a sound is played
+    while True:
+        frequency, duration = _beep_queue.get()
+        try:
+            winsound.Beep(frequency, duration)
+        except Exception as e:
+            logging.error(f"Error playing sound: {e}")
+
+def _beep(frequency, duration):
+    """Queue a sound effect without stalling the UI"""
+    global _beep_thread
+    if _beep_thread is None:
+        _beep_thread = threading.Thread(target=_beep_worker, daemon=True)
+        _beep_thread.start()
+    try:
+        _beep_queue.put_nowait((frequency, duration))
+    except queue.Full:
+        pass  # drop the sound rather than fall behind the game
+
+# Operators in the order they unlock: +/- at level 1, * at 2, / at 3
+_OPERATORS = ('+', '-', '*', '/')
+PROBLEM_TEMPLATE = "{} {} {} = ?"
+_PROBLEM_TYPE_NAME = {'+': 'addition', '-': 'subtraction', '*': 'multiplication', '/': 'division'}
+# Hint templates, only the one picked gets formatted
+_HINTS = {
+    '+': (
+        "Try counting up from {low}",
+        "Break it into smaller parts",
+        "Think: {low} + 10 would be {low_plus_10}"
+    ),
+    '-': (
+        "Count down from the larger number",
+        "What number plus {b} equals {a}?",
+        "Try counting up from {b} to {a}"
+    ),
+    '*': (
+        "Think of it as adding {a}, {b} times",
+        "If {a}×5={a_times_5}, what's {a}×{b}?",
+        "Break into easier multiplication and add"
+    ),
+    '/': (
+        "What times {b} equals {a}?",
+        "This is the same as {a} ÷ {b}",
+        "Think of it as fair sharing"
+    )
+}
+
 # define function
 def START_press():
     # open a new window (Toplevel) and hide the main window
@@ -1916,47 +2562,29 @@ def START_press():
     wrong_answers = tk.IntVar(value=0)
     current_level = tk.IntVar(value=1)
     goal = tk.IntVar(value=10)  # starts at 10, increases by 5 each level
-    problem_answer = tk.StringVar()
+    problem_answer = tk.DoubleVar()
     current_answer = tk.DoubleVar()
     total_correct = tk.IntVar(value=0)  # track total correct answers this session
     
     # Stats tracking
-    game_stats = {
-        'start_time': datetime.datetime.now(),
-        'level_start_time': datetime.datetime.now(),
-        'streak': 0,
-        'max_streak': 0,
-        'no_mistakes': True,
-        'problems_by_type': {'addition': 0, 'subtraction': 0, 'multiplication': 0, 'division': 0},
-        'total_time': 0,
-        'level_time': 0
-    }
+    game_stats = GameStats()
 
     def generate_problem():
         """Generate a random math problem with dynamic difficulty"""
         current_score = score.get()
         level = current_level.get()
-        streak = game_stats['streak']
+        streak = game_stats.streak
         
         # Dynamic difficulty adjustment
         difficulty = min(1.0, 0.5 + (level * 0.1) + (streak * 0.05))
         
         # Select operator based on level and performance
-        operators = ['+', '-']
-        if level >= 2:
-            operators.append('*')
-        if level >= 3:
-            operators.append('/')
-            
-        # Favor operators the player struggles with
-        if 'problem_success_rate' in game_stats:
-            rates = game_stats['problem_success_rate']
-            # Add more instances of operators with lower success rates
-            for op, rate in rates.items():
-                if op in operators and rate < 0.7:  # Below 70% success rate
-                    operators.extend([op] * 2)  # Add extra instances
+        operators = _OPERATORS[:min(4, level + 1)]
         
-        op = random.choice(operators)
+        # Favor operators the player struggles with (below 70% success rate)
+        rates = game_stats.problem_success_rate
+        weights = [3.0 if rates.get(o, 1.0) < 0.7 else 1.0 for o in operators]
+        op = random.choices(operators, weights=weights, k=1)[0]
         
         # Generate numbers based on difficulty
         if op in ['+', '-']:
@@ -1969,110 +2597,89 @@ def START_press():
             max_num = int(12 * difficulty)
             a = random.randint(1, max_num)
             b = random.randint(1, max_num)
-            if op == '/':  # ensure clean division
-                a = a * b  # This guarantees clean division
+            if op == '/':  # pick the quotient first so the division is clean
+                answer = a
+                a = answer * b
         
         # Calculate answer and update stats
+        # (for division the quotient was picked above, it's always a whole number)
         if op == '+': 
             answer = a + b
-            game_stats['problems_by_type']['addition'] += 1
         elif op == '-': 
             answer = a - b
-            game_stats['problems_by_type']['subtraction'] += 1
         elif op == '*': 
             answer = a * b
-            game_stats['problems_by_type']['multiplication'] += 1
-        else: 
-            answer = a / b
-            game_stats['problems_by_type']['division'] += 1
+        game_stats.problems_by_type[_PROBLEM_TYPE_NAME[op]] += 1
         
         # Track problem for analytics
-        problem_start_time = datetime.datetime.now()
-        game_stats['current_problem'] = {
+        problem_start_time = cached_now()
+        game_stats.current_problem = {
             'type': op,
             'start_time': problem_start_time,
             'numbers': (a, b),
             'answer': answer
         }
         
-        problem_answer.set(str(answer))
-        return f"{a} {op} {b} = ?"
+        problem_answer.set(answer)
+        return PROBLEM_TEMPLATE.format(a, op, b)
         
 def get_hint():
     """Generate a helpful hint for the current problem"""
-    if 'current_problem' not in game_stats:
+    if game_stats.current_problem is None:
         return "Solve the problem step by step!"
         
-    problem = game_stats['current_problem']
+    problem = game_stats.current_problem
     op = problem['type']
     a, b = problem['numbers']
     
-    hints = {
-        '+': [
-            f"Try counting up from {min(a, b)}",
-            "Break it into smaller parts",
-            f"Think: {min(a, b)} + 10 would be {min(a, b) + 10}"
-        ],
-        '-': [
-            "Count down from the larger number",
-            f"What number plus {b} equals {a}?",
-            f"Try counting up from {b} to {a}"
-        ],
-        '*': [
-            f"Think of it as adding {a}, {b} times",
-            f"If {a}×5={a*5}, what's {a}×{b}?",
-            "Break into easier multiplication and add"
-        ],
-        '/': [
-            f"What times {b} equals {a}?",
-            f"This is the same as {a} ÷ {b}",
-            "Think of it as fair sharing"
-        ]
-    }
-    
     # Use player's history to give more specific hints
-    if 'problem_success_rate' in game_stats:
-        success_rate = game_stats['problem_success_rate'].get(op, 1.0)
-        if success_rate < 0.5:  # If player struggles with this operator
-            if op == '+':
-                return f"Try adding tens first: {a} = {(a//10)*10} + {a%10}"
-            elif op == '-':
-                return f"Start from {a} and count down {b} numbers"
-            elif op == '*':
-                return f"Break it down: {a}×{b} = {a}×{b//2} + {a}×{b//2}"
-            elif op == '/':
-                return f"What number times {b} gives you {a}?"
-    
-    return random.choice(hints[op])
+    success_rate = game_stats.problem_success_rate.get(op, 1.0)
+    if success_rate < 0.5:  # If player struggles with this operator
+        if op == '+':
+            return f"Try adding tens first: {a} = {(a//10)*10} + {a%10}"
+        elif op == '-':
+            return f"Start from {a} and count down {b} numbers"
+        elif op == '*':
+            return f"Break it down: {a}×{b} = {a}×{b//2} + {a}×{b//2}"
+        elif op == '/':
+            return f"What number times {b} gives you {a}?"
+    
+    low = min(a, b)
+    return random.choice(_HINTS[op]).format(a=a, b=b, low=low, low_plus_10=low + 10, a_times_5=a * 5)
 
     def check_answer():
         """Check if the answer is correct"""
         try:
-            user_answer = float(answer_entry.get())
-            correct_answer = float(problem_answer.get())
-            if abs(user_answer - correct_answer) < 0.01:  # allow small rounding errors for division
+            raw = answer_entry.get().strip()
+            problem = game_stats.current_problem
+            if raw.lstrip('-').isdigit():  # every answer is a whole number
+                correct = int(raw) == problem['answer']
+            else:
+                # still accept input like "12.0"
+                correct = abs(float(raw) - problem_answer.get()) < 0.01
+            if correct:
                 # Update streak and stats
-                game_stats['streak'] += 1
-                game_stats['max_streak'] = max(game_stats['max_streak'], game_stats['streak'])
+                game_stats.streak += 1
+                game_stats.max_streak = max(game_stats.max_streak, game_stats.streak)
                 
                 # Correct answer
                 score.set(score.get() + 1)
                 total_correct.set(total_correct.get() + 1)  # increment total correct
                 result_label.config(text="✓", fg="green")
                 # Play correct sound (high beep)
-                winsound.Beep(1000, 200)  # 1000 Hz for 200ms
+                _beep(1000, 200)  # 1000 Hz for 200ms
                 if score.get() >= goal.get():
                     next_level()
                 else:
                     problem_label.config(text=generate_problem())
             else:
                 # Wrong answer
-                game_stats['streak'] = 0  # Reset streak on wrong answer
-                game_stats['no_mistakes'] = False  # Mark that there was a mistake
+                game_stats.streak = 0  # Reset streak on wrong answer
+                game_stats.no_mistakes = False  # Mark that there was a mistake
                 wrong_answers.set(wrong_answers.get() + 1)
                 result_label.config(text="X", fg="red")
                 # Play wrong sound (low beep)
-                winsound.Beep(250, 300)  # 250 Hz for 300ms
+                _beep(250, 300)  # 250 Hz for 300ms
                 if wrong_answers.get() >= 3:
                     game_over()
                 else:
@@ -2094,10 +2701,10 @@ def get_hint():
         wrong_answers.set(0)
         
         # Update level time
-        now = datetime.datetime.now()
-        game_stats['level_time'] = (now - game_stats['level_start_time']).total_seconds()
-        game_stats['total_time'] += game_stats['level_time']
-        game_stats['level_start_time'] = now
+        now = time.monotonic()
+        game_stats.level_time = now - game_stats.level_start_mono
+        game_stats.total_time += game_stats.level_time
+        game_stats.level_start_mono = now
         
         # Save profile progress when advancing levels with win result
         save_profile(current_profile, new_level, total_correct.get(), 'win', game_stats)
@@ -2105,30 +2712,36 @@ def get_hint():
         problem_label.config(text=generate_problem())
         level_label.config(text=f"Level {new_level}")
         # Play victory sound for level up
-        winsound.Beep(1500, 150)
-        winsound.Beep(2000, 150)
+        _beep(1500, 150)
+        _beep(2000, 150)
 
     def game_over(reason="mistakes"):
         """Handle game over state"""
         # Update final timing stats
-        now = datetime.datetime.now()
-        game_stats['level_time'] = (now - game_stats['level_start_time']).total_seconds()
-        game_stats['total_time'] += game_stats['level_time']
+        game_stats.level_time = time.monotonic() - game_stats.level_start_mono
+        game_stats.total_time += game_stats.level_time
         
         # Save final scores to profile with game result
         save_profile(current_profile, current_level.get(), total_correct.get(), 'lose', game_stats)
+        _flush_progress()
         problem_label.config(text="Game Over!")
         answer_entry.config(state='disabled')
         submit_btn.config(state='disabled')
         # Play game over sound
-        winsound.Beep(500, 200)
-        winsound.Beep(350, 400)
+        _beep(500, 200)
+        _beep(350, 400)
 
     def update_achievements_display():
         """Update the achievements display"""
+        nonlocal shown_achievements
         profiles = load_profiles()
         profile = profiles.get(current_profile, {})
         achievements = profile.get('achievements', [])
+        # check_achievements only builds a new list when one is granted,
+        # so the same list object means nothing to redraw
+        if achievements is shown_achievements:
+            return
+        shown_achievements = achievements
         
         achievements_text.config(state='normal')
         achievements_text.delete('1.0', tk.END)
@@ -2143,6 +2756,7 @@ def get_hint():
 
     def update_status():
         """Update the status display"""
+        nonlocal last_status
         profiles = load_profiles()
         profile = profiles.get(current_profile, {
             'highest_level': 1, 
@@ -2156,30 +2770,22 @@ def get_hint():
         games_played = profile.get('games_played', 0)
         win_rate = (profile.get('games_won', 0) / games_played * 100) if games_played > 0 else 0
         
-        status_label.config(
-            text=f"{profile['avatar']} Profile: {current_profile}\n" +
-                 f"Score: {score.get()}/{goal.get()} | Wrong: {wrong_answers.get()}/3 | Level: {current_level.get()}\n" +
-                 f"Best Level: {profile['highest_level']} | Total Correct: {profile['total_correct'] + total_correct.get()}\n" +
-                 f"Games Played: {games_played} | Win Rate: {win_rate:.1f}%"
-        )
+        text = (f"{profile['avatar']} Profile: {current_profile}\n" +
+                f"Score: {score.get()}/{goal.get()} | Wrong: {wrong_answers.get()}/3 | Level: {current_level.get()}\n" +
+                f"Best Level: {profile['highest_level']} | Total Correct: {profile['total_correct'] + total_correct.get()}\n" +
+                f"Games Played: {games_played} | Win Rate: {win_rate:.1f}%")
+        # Only touch the label when the text changed, to skip a relayout
+        if text != last_status:
+            last_status = text
+            status_label.config(text=text)
 
     def back_to_menu():
         window.destroy()
         root.deiconify()
 
     def start_game(challenge_type=None):
-        global game_stats
         # Reset game statistics
-        game_stats.update({
-            'start_time': datetime.datetime.now(),
-            'level_start_time': datetime.datetime.now(),
-            'streak': 0,
-            'max_streak': 0,
-            'no_mistakes': True,
-            'problems_by_type': {'addition': 0, 'subtraction': 0, 'multiplication': 0, 'division': 0},
-            'total_time': 0,
-            'level_time': 0
-        })
+        game_stats.reset()
         
         # hide game_frame and show play_frame
         game_frame.pack_forget()
@@ -2210,17 +2816,23 @@ def get_hint():
         submit_btn.config(state='normal')
         update_status()
 
+    # Sizes used by the widgets below, looked up once
+    pad5w, pad5h = game_layout.get_widget_size(5)
+    pad6h = game_layout.get_widget_size(6)[1]
+    pad10w, pad10h = game_layout.get_widget_size(10)
+    pad20w, pad20h = game_layout.get_widget_size(20)
+    f14, f16, f18, f20, f24 = (game_layout.get_font_size(n) for n in (14, 16, 18, 20, 24))
+
     # Game frame content (instructions)
-    scaled_font = ("Arial", game_layout.get_font_size(16))
-    scaled_bold = ("Arial", game_layout.get_font_size(16), "bold")
-    scaled_large = ("Arial", game_layout.get_font_size(20), "bold")
+    scaled_font = ("Arial", f16)
+    scaled_bold = ("Arial", f16, "bold")
+    scaled_large = ("Arial", f20, "bold")
     
     instructions = tk.Label(game_frame, 
                           text="Solve math problems to advance levels!\nGet 3 wrong and it's game over.\nReach the goal to win each level!", 
                           font=scaled_font,
                           bg=THEME['background'])
-    instructions.pack(padx=game_layout.get_widget_size(20)[0], 
-                     pady=game_layout.get_widget_size(20)[1])
+    instructions.pack(padx=pad20w, pady=pad20h)
     
     # Update button style with scaled sizes
     game_button_style = button_style.copy()
@@ -2232,15 +2844,15 @@ def get_hint():
     })
     
     tk.Button(game_frame, text="Start Game", command=start_game, 
-              **game_button_style).pack(pady=game_layout.get_widget_size(6)[1])
+              **game_button_style).pack(pady=pad6h)
     tk.Button(game_frame, text="Back to Menu", command=back_to_menu, 
-              **game_button_style).pack(pady=game_layout.get_widget_size(6)[1])
+              **game_button_style).pack(pady=pad6h)
 
     # Play frame content (game interface)
     level_label = tk.Label(play_frame, text="Level 1", 
                           font=scaled_large,
                           bg=THEME['background'])
-    level_label.pack(pady=game_layout.get_widget_size(10)[1])
+    level_label.pack(pady=pad10h)
     
     # Challenge mode label
     challenge_label = tk.Label(play_frame, text="", 
@@ -2272,10 +2884,11 @@ def get_hint():
         
         update_timer()
     
+    last_status = ""  # text currently shown in status_label
     status_label = tk.Label(play_frame, text="", 
                           font=scaled_font,
                           bg=THEME['background'])
-    status_label.pack(pady=game_layout.get_widget_size(5)[1])
+    status_label.pack(pady=pad5h)
     
     # Achievements display with responsive layout
     achievements_frame = tk.Frame(play_frame, bg=THEME['background'])
@@ -2295,7 +2908,7 @@ def get_hint():
     
     tk.Label(achievements_frame, text="🏅 Achievements 🏅", 
              font=scaled_bold,
-             bg=THEME['background']).pack(pady=game_layout.get_widget_size(5)[1])
+             bg=THEME['background']).pack(pady=pad5h)
     
     # Scale text widget size based on orientation
     def get_achievement_size():
@@ -2309,37 +2922,38 @@ def get_hint():
                               width=width, height=height,
                               bg='#f0f0f0',
                               relief='ridge')
-    achievements_text.pack(pady=game_layout.get_widget_size(5)[1])
+    achievements_text.pack(pady=pad5h)
     achievements_text.config(state='disabled')
+    shown_achievements = None  # list currently rendered in achievements_text
     
     # Frame to hold problem and result side by side
     problem_frame = tk.Frame(play_frame, bg=THEME['background'])
-    problem_frame.pack(pady=game_layout.get_widget_size(20)[1])
+    problem_frame.pack(pady=pad20h)
     
     # Use larger font for math problem
-    problem_font = ("Arial", game_layout.get_font_size(24))
-    problem_font_bold = ("Arial", game_layout.get_font_size(24), "bold")
+    problem_font = ("Arial", f24)
+    problem_font_bold = ("Arial", f24, "bold")
     
     problem_label = tk.Label(problem_frame, text="", 
                            font=problem_font,
                            bg=THEME['background'])
-    problem_label.pack(side=tk.LEFT, padx=game_layout.get_widget_size(5)[0])
+    problem_label.pack(side=tk.LEFT, padx=pad5w)
     
     # Label for showing ✓ or X
     result_label = tk.Label(problem_frame, text="", 
                           font=problem_font_bold,
                           bg=THEME['background'])
-    result_label.pack(side=tk.LEFT, padx=game_layout.get_widget_size(5)[0])
+    result_label.pack(side=tk.LEFT, padx=pad5w)
     
     answer_frame = tk.Frame(play_frame, bg=THEME['background'])
-    answer_frame.pack(pady=game_layout.get_widget_size(10)[1])
+    answer_frame.pack(pady=pad10h)
     
     # Scale entry width based on screen size
-    entry_width = game_layout.get_widget_size(10)[0]
+    entry_width = pad10w
     answer_entry = tk.Entry(answer_frame, 
-                          font=("Arial", game_layout.get_font_size(18)),
+                          font=("Arial", f18),
                           width=min(20, max(8, entry_width // 20)))  # scale width but keep reasonable
-    answer_entry.pack(side=tk.LEFT, padx=game_layout.get_widget_size(5)[0])
+    answer_entry.pack(side=tk.LEFT, padx=pad5w)
     answer_entry.bind('<Return>', lambda e: check_answer())
     
     # Enable touch keyboard for answer entry (numeric only)
@@ -2351,12 +2965,12 @@ def get_hint():
     # Update button style with game-scaled sizes
     submit_btn_style = game_button_style.copy()
     submit_btn_style.update({
-        'font': ("Arial", game_layout.get_font_size(14), "bold")
+        'font': ("Arial", f14, "bold")
     })
     submit_btn = tk.Button(answer_frame, text="Submit", 
                          command=check_answer, 
                          **submit_btn_style)
-    submit_btn.pack(side=tk.LEFT, padx=game_layout.get_widget_size(5)[0])
+    submit_btn.pack(side=tk.LEFT, padx=pad5w)
     
     tk.Button(play_frame, text="Back to Menu", command=back_to_menu, **button_style).pack(pady=10)
 
@@ -7,6 +7,7 @@
 import random
 import tkinter as tk
 from tkinter import ttk, messagebox
+import tkinter.font as tkfont
 import json
 import os
 import datetime
@@ -14,6 +15,8 @@ import sys
 import time
 import ctypes
 import logging
+import threading
+import concurrent.futures
 
 # ------------------- Optional imports (safe) -------------------
 try:
@@ -26,6 +29,16 @@ try:
 except Exception:
     wmi = None
 
+try:
+    import orjson  # faster profile file reads/writes when installed
+except Exception:
+    orjson = None
+
+try:
+    import numpy as np  # only used to pre-draw random numbers in batches
+except Exception:
+    np = None
+
 # ------------------- Logging -----------------------------------
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
@@ -45,22 +58,82 @@ ACHIEVEMENTS = {
     "level_master": {"name": "Level Master", "icon": "Master"},
     "math_wizard": {"name": "Math Wizard", "icon": "Wizard"}
 }
+# One bit per achievement, so the checks are plain integer math
+ACH_BEGINNER = 1
+ACH_PERFECT_10 = 2
+ACH_LEVEL_MASTER = 4
+ACH_MATH_WIZARD = 8
+ACHIEVEMENT_BITS = (
+    ("beginner", ACH_BEGINNER),
+    ("perfect_10", ACH_PERFECT_10),
+    ("level_master", ACH_LEVEL_MASTER),
+    ("math_wizard", ACH_MATH_WIZARD),
+)
 
 # ------------------- Profile Helpers ---------------------------
+def _json_dumps(obj):
+    """Compact UTF-8 JSON bytes, via orjson when it's installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def _json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+PROBLEM_BATCH = 64  # problems' worth of random draws made at once
+_py_rng = random.Random()  # problem draws when NumPy isn't installed
+
 PROFILES_FILE = "mathblast_profiles.json"
+PROFILE_FLUSH_MS = 30000  # write changed profiles at most this often while playing
+
+# Profiles are read once and kept here; save_profile only marks them dirty
+_PROFILES_CACHE = None
+_PROFILES_DIRTY = False
+_PROFILES_LOCK = threading.Lock()
 
 def load_profiles():
-    if not os.path.exists(PROFILES_FILE):
-        return {}
-    try:
-        with open(PROFILES_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, dict) else {}
-    except Exception as e:
-        logging.warning(f"Failed to load profiles: {e}")
-        return {}
+    global _PROFILES_CACHE
+    if _PROFILES_CACHE is not None:
+        return _PROFILES_CACHE
+    data = {}
+    if os.path.exists(PROFILES_FILE):
+        try:
+            with open(PROFILES_FILE, "rb") as f:
+                data = _json_loads(f.read())
+                if not isinstance(data, dict):
+                    data = {}
+        except Exception as e:
+            logging.warning(f"Failed to load profiles: {e}")
+    _PROFILES_CACHE = data
+    return data
+
+def flush_profiles():
+    """Write the profiles file if anything changed since the last write"""
+    global _PROFILES_DIRTY
+    with _PROFILES_LOCK:
+        if not _PROFILES_DIRTY:
+            return
+        tmp = PROFILES_FILE + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(_json_dumps(_PROFILES_CACHE))
+            os.replace(tmp, PROFILES_FILE)
+            _PROFILES_DIRTY = False
+        except Exception as e:
+            logging.error(f"Save failed: {e}")
+
+def achievement_mask(games_played, max_streak, highest_level, total_correct, mask=0):
+    # Ints in, int out: cheap in Python and a drop-in for a compiled version
+    if games_played >= 1: mask |= ACH_BEGINNER
+    if max_streak >= 10: mask |= ACH_PERFECT_10
+    if highest_level >= 5: mask |= ACH_LEVEL_MASTER
+    if total_correct >= 100: mask |= ACH_MATH_WIZARD
+    return mask
 
 def save_profile(name, highest_level, total_correct, game_result=None, stats=None):
+    global _PROFILES_DIRTY
     profiles = load_profiles()
     profile = profiles.setdefault(name, {
         "highest_level": 1,
@@ -90,29 +163,64 @@ def save_profile(name, highest_level, total_correct, game_result=None, stats=Non
         s["total_time"] = s.get("total_time", 0) + stats.get("total_time", 0)
         profile["stats"] = s
 
-    # Check achievements
-    ach = set(profile.get("achievements", []))
-    if "beginner" not in ach and profile["games_played"] >= 1:
-        ach.add("beginner")
-    if "perfect_10" not in ach and s.get("max_streak", 0) >= 10:
-        ach.add("perfect_10")
-    if "level_master" not in ach and profile["highest_level"] >= 5:
-        ach.add("level_master")
-    if "math_wizard" not in ach and profile["total_correct"] >= 100:
-        ach.add("math_wizard")
-    profile["achievements"] = list(ach)
-
-    try:
-        with open(PROFILES_FILE, "w", encoding="utf-8") as f:
-            json.dump(profiles, f, indent=2)
-    except Exception as e:
-        logging.error(f"Save failed: {e}")
+    # Check achievements (the mask is stored; the id list is kept for readers of the file)
+    old_mask = profile.get("ach_mask")
+    if old_mask is None:  # older profile, derive the mask from the list once
+        ach = profile.get("achievements", [])
+        old_mask = 0
+        for ach_id, bit in ACHIEVEMENT_BITS:
+            if ach_id in ach:
+                old_mask |= bit
+    mask = achievement_mask(profile["games_played"], profile["stats"].get("max_streak", 0),
+                            profile["highest_level"], profile["total_correct"], old_mask)
+    if mask != old_mask or "ach_mask" not in profile:
+        profile["achievements"] = [ach_id for ach_id, bit in ACHIEVEMENT_BITS if mask & bit]
+    profile["ach_mask"] = mask
+    _PROFILES_DIRTY = True  # written by flush_profiles
+
+# ------------------- Problem Math -----------------------------
+OPS = ("+", "-", "*", "/")
+OP_TYPES = ("addition", "subtraction", "multiplication", "division")
+
+def _problem_numbers(level, streak, u_op, u_a, u_b):
+    # Numbers only (no strings/dicts); u_* are uniform [0, 1) draws.
+    # Returns (index into OPS, a, b, answer)
+    diff = min(1.0, 0.5 + level*0.1 + streak*0.05)
+    n_ops = 2
+    if level >= 2: n_ops += 1
+    if level >= 3: n_ops += 1
+    op = int(u_op * n_ops)
+    if op < 2:
+        mx = int(50 * diff)
+        a, b = 1 + int(u_a * mx), 1 + int(u_b * mx)
+        if op == 1 and diff < 0.7 and a < b:
+            a, b = b, a
+        ans = a + b if op == 0 else a - b
+    else:
+        mx = int(12 * diff)
+        a, b = 1 + int(u_a * mx), 1 + int(u_b * mx)
+        if op == 2:
+            ans = a * b
+        else:
+            ans = a  # pick the quotient, show a multiple of b
+            a = a * b
+    return op, a, b, ans
 
 # ------------------- Layout Manager ---------------------------
 class LayoutManager:
     def __init__(self, root):
         self.root = root
         self.base_w, self.base_h = 1200, 800
+        self._font_cache = {}  # base -> scaled font size
+        self._size_cache = {}  # (w, h) -> scaled size
+        self._fonts = {}  # (base, bold) -> shared tkfont.Font
+        self._last_size = (0, 0)
+        self._resize_after = None
+        # DPI doesn't change during a session, don't ask Tk on every resize
+        try:
+            self.dpi = self.root.winfo_fpixels('1i')  # Tk DPI
+        except Exception:
+            self.dpi = 96
         self.update_screen()
         self.root.bind("<Configure>", self._on_resize)
 
@@ -120,23 +228,53 @@ class LayoutManager:
         try:
             self.screen_w = self.root.winfo_screenwidth()
             self.screen_h = self.root.winfo_screenheight()
-            self.dpi = self.root.winfo_fpixels('1i')  # Tk DPI
         except Exception:
             self.screen_w = 1200
             self.screen_h = 800
-            self.dpi = 96
         self.scale = min(self.screen_w / self.base_w, self.screen_h / self.base_h, 1.0)
+        self._font_cache.clear()
+        self._size_cache.clear()
+        # Resize the shared fonts in place, every widget using them follows
+        for (base, bold), f in self._fonts.items():
+            f.configure(size=self.font(base))
 
     def _on_resize(self, event=None):
-        if event and event.widget == self.root:
-            self.update_screen()
+        if not event or event.widget is not self.root:
+            return
+        size = (event.width, event.height)
+        if size == self._last_size:  # moved, not resized
+            return
+        self._last_size = size
+        # <Configure> fires for every pixel of a drag, update once it settles
+        if self._resize_after:
+            self.root.after_cancel(self._resize_after)
+        self._resize_after = self.root.after(50, self._apply_resize)
+
+    def _apply_resize(self):
+        self._resize_after = None
+        self.update_screen()
 
     def font(self, base):
-        return int(base * self.scale)
+        size = self._font_cache.get(base)
+        if size is None:
+            size = self._font_cache[base] = int(base * self.scale)
+        return size
+
+    def get_font(self, base, bold=False):
+        """A Font object shared by every widget with this base size and weight"""
+        f = self._fonts.get((base, bold))
+        if f is None:
+            f = tkfont.Font(root=self.root, family=THEME["font"], size=self.font(base),
+                            weight="bold" if bold else "normal")
+            self._fonts[(base, bold)] = f
+        return f
 
     def size(self, w, h=None):
         if h is None: h = w
-        return int(w * self.scale), int(h * self.scale)
+        scaled = self._size_cache.get((w, h))
+        if scaled is None:
+            scaled = self._size_cache[(w, h)] = (int(w * self.scale), int(h * self.scale))
+        return scaled
 
 # ------------------- Main App ---------------------------------
 class MathBlastApp:
@@ -154,17 +292,37 @@ class MathBlastApp:
         self.total_correct = tk.IntVar()
         self.answer_var = tk.StringVar()
         self.game_stats = {}
+        self._answer = None
+        self._last_status = None
+        self._clear_after_id = None
+        # winsound.Beep blocks for the whole sound, so play sounds on one worker
+        self._beep_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._btn_style = None
+        self._rng = np.random.default_rng() if np is not None else None
+        self._draws = []
+        self._draw_i = 0
+        # Each screen is built the first time it's shown, then reused
+        self._menu_frame = None
+        self._game_frame = None
 
         self.build_main_menu()
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(PROFILE_FLUSH_MS, self._periodic_flush)
 
     # ------------------- UI Builders ---------------------------
     def build_main_menu(self):
-        self.clear_frame()
+        if self._game_frame is not None:
+            self._game_frame.pack_forget()
+        if self._menu_frame is None:
+            self._menu_frame = self._build_menu_frame()
+        else:
+            self.refresh_profiles()
+        self._menu_frame.pack(expand=True, fill="both", padx=20, pady=20)
+
+    def _build_menu_frame(self):
         frame = tk.Frame(self.root, bg=THEME["bg"])
-        frame.pack(expand=True, fill="both", padx=20, pady=20)
 
-        tk.Label(frame, text="MathBlast", font=("Arial", self.layout.font(32), "bold"),
+        tk.Label(frame, text="MathBlast", font=self.layout.get_font(32, bold=True),
                  bg=THEME["bg"]).pack(pady=20)
 
         # Profile selector
@@ -179,34 +337,46 @@ class MathBlastApp:
                   **self.btn_style()).pack(pady=15, fill="x")
 
         tk.Button(frame, text="Exit", command=self.root.quit,
-                  bg="#dc3545", fg="white", **self.btn_style()).pack(pady=5, fill="x")
+                  **dict(self.btn_style(), bg="#dc3545", fg="white")).pack(pady=5, fill="x")
+        return frame
 
     def build_game_screen(self):
-        self.clear_frame()
+        if self._menu_frame is not None:
+            self._menu_frame.pack_forget()
+        if self._game_frame is None:
+            self._game_frame = self._build_game_frame()
+        else:
+            # Undo what the last game left behind
+            self.level_label.config(text="Level 1")
+            self.result_lbl.config(text="")
+            self.entry.config(state="normal")
+            self.entry.delete(0, tk.END)
+        self._game_frame.pack(expand=True, fill="both", padx=20, pady=10)
+
+    def _build_game_frame(self):
         frame = tk.Frame(self.root, bg=THEME["bg"])
-        frame.pack(expand=True, fill="both", padx=20, pady=10)
 
         # Header
-        tk.Label(frame, textvariable=tk.StringVar(), font=("Arial", self.layout.font(24), "bold"),
+        tk.Label(frame, text="", font=self.layout.get_font(24, bold=True),
                  bg=THEME["bg"]).pack()
-        self.level_label = tk.Label(frame, text="Level 1", font=("Arial", self.layout.font(20)),
+        self.level_label = tk.Label(frame, text="Level 1", font=self.layout.get_font(20),
                                     bg=THEME["bg"])
         self.level_label.pack(pady=5)
 
         # Problem
         prob_frame = tk.Frame(frame, bg=THEME["bg"])
         prob_frame.pack(pady=20)
-        self.problem_lbl = tk.Label(prob_frame, text="", font=("Arial", self.layout.font(28)),
+        self.problem_lbl = tk.Label(prob_frame, text="", font=self.layout.get_font(28),
                                     bg=THEME["bg"])
         self.problem_lbl.pack(side="left", padx=10)
-        self.result_lbl = tk.Label(prob_frame, text="", font=("Arial", self.layout.font(28), "bold"),
+        self.result_lbl = tk.Label(prob_frame, text="", font=self.layout.get_font(28, bold=True),
                                    bg=THEME["bg"])
         self.result_lbl.pack(side="left", padx=10)
 
         # Answer
         ans_frame = tk.Frame(frame, bg=THEME["bg"])
         ans_frame.pack(pady=10)
-        self.entry = tk.Entry(ans_frame, textvariable=tk.StringVar(), font=("Arial", self.layout.font(20)),
+        self.entry = tk.Entry(ans_frame, font=self.layout.get_font(20),
                               width=15, justify="center")
         self.entry.pack(side="left", padx=5)
         self.entry.bind("<Return>", lambda e: self.check_answer())
@@ -215,28 +385,28 @@ class MathBlastApp:
                   **self.btn_style()).pack(side="left", padx=5)
 
         # Status
-        self.status_lbl = tk.Label(frame, text="", font=("Arial", self.layout.font(12)),
+        self.status_lbl = tk.Label(frame, text="", font=self.layout.get_font(12),
                                    bg=THEME["bg"], justify="left")
         self.status_lbl.pack(pady=10, anchor="w")
 
         tk.Button(frame, text="Back to Menu", command=self.back_to_menu,
                   **self.btn_style()).pack(pady=10)
+        return frame
 
     # ------------------- Helpers -------------------------------
     def btn_style(self):
-        return {
-            "font": ("Arial", self.layout.font(14), "bold"),
-            "bg": THEME["btn_bg"],
-            "fg": THEME["btn_fg"],
-            "activebackground": THEME["btn_active"],
-            "relief": "raised",
-            "padx": 10,
-            "pady": 5
-        }
-
-    def clear_frame(self):
-        for child in self.root.winfo_children():
-            child.destroy()
+        # Shared by every button; its Font is resized in place by the layout
+        if self._btn_style is None:
+            self._btn_style = {
+                "font": self.layout.get_font(14, bold=True),
+                "bg": THEME["btn_bg"],
+                "fg": THEME["btn_fg"],
+                "activebackground": THEME["btn_active"],
+                "relief": "raised",
+                "padx": 10,
+                "pady": 5
+            }
+        return self._btn_style
 
     def refresh_profiles(self):
         profiles = load_profiles()
@@ -278,47 +448,41 @@ class MathBlastApp:
             "no_mistakes": True,
             "problems_by_type": {"addition":0, "subtraction":0, "multiplication":0, "division":0},
             "total_time": 0,
-            "level_start": datetime.datetime.now()
+            "level_start": time.monotonic()  # durations only, not a wall-clock time
         }
 
     def new_problem(self):
         level = self.level.get()
         streak = self.game_stats.get("streak", 0)
-        diff = min(1.0, 0.5 + level*0.1 + streak*0.05)
-
-        ops = ["+", "-"]
-        if level >= 2: ops.append("*")
-        if level >= 3: ops.append("/")
-
-        op = random.choice(ops)
-        if op in "+-":
-            mx = int(50 * diff)
-            a, b = random.randint(1, mx), random.randint(1, mx)
-            if op == "-" and diff < 0.7:
-                a, b = max(a,b), min(a,b)
-        else:
-            mx = int(12 * diff)
-            a, b = random.randint(1, mx), random.randint(1, mx)
-            if op == "/":
-                a = a * b
-
-        if op == "+": ans = a + b
-        elif op == "-": ans = a - b
-        elif op == "*": ans = a * b
-        else: ans = a / b
-
-        self.game_stats["problems_by_type"][
-            {"+": "addition", "-": "subtraction", "*": "multiplication", "/": "division"}[op]
-        ] += 1
+        op_i, a, b, ans = _problem_numbers(level, streak, *self.next_draws())
+        op = OPS[op_i]
+        self.game_stats["problems_by_type"][OP_TYPES[op_i]] += 1
 
+        self._answer = ans
         self.answer_var.set(str(ans))
         self.problem_lbl.config(text=f"{a} {op} {b} = ?")
 
+    def next_draws(self):
+        # Difficulty moves with the streak, so pre-draw the random numbers
+        # rather than whole problems
+        if self._rng is None:
+            rand = _py_rng.random
+            return rand(), rand(), rand()
+        if self._draw_i >= len(self._draws):
+            self._draws = self._rng.random((PROBLEM_BATCH, 3)).tolist()
+            self._draw_i = 0
+        draws = self._draws[self._draw_i]
+        self._draw_i += 1
+        return draws
+
     def check_answer(self):
         try:
-            user = float(self.entry.get())
-            correct = float(self.answer_var.get())
-            if abs(user - correct) < 0.01:
+            raw = self.entry.get().strip()
+            if raw.lstrip("-").isdigit():  # answers are always whole numbers
+                ok = int(raw) == self._answer
+            else:
+                ok = abs(float(raw) - self._answer) < 0.01  # still accept "12.0"
+            if ok:
                 self.game_stats["streak"] = self.game_stats.get("streak", 0) + 1
                 self.game_stats["max_streak"] = max(self.game_stats.get("max_streak", 0), self.game_stats["streak"])
                 self.score.set(self.score.get() + 1)
@@ -341,10 +505,17 @@ class MathBlastApp:
                     self.new_problem()
             self.entry.delete(0, tk.END)
             self.update_status()
-            self.root.after(800, lambda: self.result_lbl.config(text=""))
+            # One pending clear at a time, so a fast answer isn't wiped early
+            if self._clear_after_id:
+                self.root.after_cancel(self._clear_after_id)
+            self._clear_after_id = self.root.after(800, self._clear_result)
         except ValueError:
             pass
 
+    def _clear_result(self):
+        self._clear_after_id = None
+        self.result_lbl.config(text="")
+
     def next_level(self):
         lvl = self.level.get() + 1
         self.level.set(lvl)
@@ -352,8 +523,8 @@ class MathBlastApp:
         self.score.set(0)
         self.wrong.set(0)
 
-        now = datetime.datetime.now()
-        self.game_stats["level_time"] = (now - self.game_stats["level_start"]).total_seconds()
+        now = time.monotonic()
+        self.game_stats["level_time"] = now - self.game_stats["level_start"]
         self.game_stats["total_time"] = self.game_stats.get("total_time", 0) + self.game_stats["level_time"]
         self.game_stats["level_start"] = now
 
@@ -365,8 +536,8 @@ class MathBlastApp:
         self.new_problem()
 
     def game_over(self):
-        now = datetime.datetime.now()
-        self.game_stats["level_time"] = (now - self.game_stats["level_start"]).total_seconds()
+        now = time.monotonic()
+        self.game_stats["level_time"] = now - self.game_stats["level_start"]
         self.game_stats["total_time"] = self.game_stats.get("total_time", 0) + self.game_stats["level_time"]
         save_profile(self.current_profile.get(), self.level.get(), self.total_correct.get(),
                      game_result="lose", stats=self.game_stats)
@@ -375,31 +546,45 @@ class MathBlastApp:
         self.beep(500, 200); self.beep(350, 400)
 
     def update_status(self):
-        prof = load_profiles().get(self.current_profile.get(), {})
+        # load_profiles hands back the in-memory cache, no file read here
+        name = self.current_profile.get()
+        prof = load_profiles().get(name, {})
         games = prof.get("games_played", 0)
         win_rate = (prof.get("games_won", 0) / games * 100) if games else 0
-        self.status_lbl.config(
-            text=f"{prof.get('avatar','User')} {self.current_profile.get()}\n"
-                 f"Score: {self.score.get()}/{self.goal.get()} | Wrong: {self.wrong.get()}/3 | Level: {self.level.get()}\n"
-                 f"Best: {prof.get('highest_level',1)} | Total: {prof.get('total_correct',0)+self.total_correct.get()}\n"
-                 f"Games: {games} | Win: {win_rate:.1f}%"
-        )
+        text = (f"{prof.get('avatar','User')} {name}\n"
+                f"Score: {self.score.get()}/{self.goal.get()} | Wrong: {self.wrong.get()}/3 | Level: {self.level.get()}\n"
+                f"Best: {prof.get('highest_level',1)} | Total: {prof.get('total_correct',0)+self.total_correct.get()}\n"
+                f"Games: {games} | Win: {win_rate:.1f}%")
+        if text != self._last_status:  # skip the relayout when nothing changed
+            self._last_status = text
+            self.status_lbl.config(text=text)
 
     def back_to_menu(self):
         self.build_main_menu()
 
     def beep(self, freq, dur):
         if winsound:
-            try:
-                winsound.Beep(freq, dur)
-            except Exception:
-                pass
+            self._beep_pool.submit(self._play_beep, freq, dur)
+
+    @staticmethod
+    def _play_beep(freq, dur):
+        try:
+            winsound.Beep(freq, dur)
+        except Exception:
+            pass
+
+    def _periodic_flush(self):
+        flush_profiles()
+        self.root.after(PROFILE_FLUSH_MS, self._periodic_flush)
 
     def on_close(self):
+        flush_profiles()
+        self._beep_pool.shutdown(wait=False)
         self.root.destroy()
 
 # ------------------- Run App -----------------------------------
 if __name__ == "__main__":
     root = tk.Tk()
     app = MathBlastApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    flush_profiles()  # the Exit button quits without going through on_close
\ No newline at end of file
@@ -15,7 +15,13 @@ import socket
 import platform as sys_platform
 import logging
 import time
+import atexit
+import operator
 import subprocess
+from collections import deque, namedtuple
+import functools
+import importlib
+import importlib.util
 import sys
 import os
 # -----------------------------------------------------------
@@ -103,107 +109,193 @@ start_local_server()
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
 # ------------------- Platform Detection -------------------
+# sys.platform -> our platform name
+_SYS_PLATFORMS = {
+    'darwin': 'macos',
+    'ios': 'ios',
+    'win32': 'windows',
+    'cygwin': 'windows',
+    'linux': 'linux',
+    'android': 'android',
+    'emscripten': 'web',
+    'wasi': 'web',
+}
+
+def _log_platform_details(platform_name):
+    """Log version/distribution info (extra syscalls, so only when INFO is on)."""
+    try:
+        if platform_name == 'macos':
+            logging.info(f"Detected macOS version: {sys_platform.mac_ver()[0]}")
+        elif platform_name == 'windows':
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
+                              r"SOFTWARE\Microsoft\Windows NT\CurrentVersion") as key:
+                build = winreg.QueryValueEx(key, "CurrentBuildNumber")[0]
+                logging.info(f"Detected Windows build: {build}")
+        elif platform_name == 'linux':
+            import mmap
+            with open('/etc/os-release', 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # NAME= must start a line (PRETTY_NAME= would also match mid-line)
+                i = 0 if mm[:5] == b'NAME=' else mm.find(b'\nNAME=')
+                distro = ''
+                if i != -1:
+                    i = mm.find(b'NAME=', i)
+                    j = mm.find(b'\n', i)
+                    distro = mm[i:j if j != -1 else len(mm)].decode('utf-8', 'replace')
+                logging.info(f"Detected Linux distribution: {distro.strip()}")
+        elif platform_name == 'android':
+            logging.info(f"Detected Android API level: {sys.getandroidapilevel()}")
+    except Exception as e:
+        logging.warning(f"Platform detail detection failed: {e}")
+
+@functools.lru_cache(maxsize=1)
 def detect_platform():
     """Detect current platform with fallbacks and detailed info."""
     try:
-        # Android detection
+        # Android builds of CPython still report 'linux' on older versions
         if hasattr(sys, 'getandroidapilevel'):
-            try:
-                api_level = sys.getandroidapilevel()
-                logging.info(f"Detected Android API level: {api_level}")
-                return 'android'
-            except Exception as e:
-                logging.error(f"Android API detection failed: {e}")
-        
+            platform_name = 'android'
         # Web/Pyodide detection
-        if any(key in os.environ for key in ['PYODIDE', 'WASM', 'EMSCRIPTEN']):
-            logging.info("Detected Web/WASM environment")
-            return 'web'
-        
-        # Apple platform detection
-        if sys_platform.system() == 'Darwin':
-            try:
-                version = sys_platform.mac_ver()[0]
-                if version:
-                    logging.info(f"Detected macOS version: {version}")
-                    return 'macos'
-                else:
-                    logging.info("Detected iOS device")
-                    return 'ios'
-            except Exception as e:
-                logging.error(f"Apple platform detection error: {e}")
-                return 'macos'  # Safe fallback
-        
-        # Windows detection with version info
-        elif sys_platform.system() == 'Windows':
-            try:
-                import winreg
-                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
-                                  r"SOFTWARE\Microsoft\Windows NT\CurrentVersion") as key:
-                    build = winreg.QueryValueEx(key, "CurrentBuildNumber")[0]
-                    logging.info(f"Detected Windows build: {build}")
-            except Exception as e:
-                logging.warning(f"Windows version detection failed: {e}")
-            return 'windows'
-        
-        # Linux with distribution detection
-        elif sys_platform.system() == 'Linux':
-            try:
-                with open('/etc/os-release') as f:
-                    lines = f.readlines()
-                    distro = next((l for l in lines if l.startswith('NAME=')), '')
-                    logging.info(f"Detected Linux distribution: {distro.strip()}")
-            except Exception as e:
-                logging.warning(f"Linux distribution detection failed: {e}")
-            return 'linux'
-        
-        # Unknown platform
+        elif any(key in os.environ for key in ('PYODIDE', 'WASM', 'EMSCRIPTEN')):
+            platform_name = 'web'
         else:
-            logging.warning(f"Unknown platform: {sys_platform.system()}")
-            return 'unknown'
-            
+            platform_name = _SYS_PLATFORMS.get(sys.platform, 'unknown')
+            # iOS before Python 3.13 reports 'darwin' but has no macOS version
+            if platform_name == 'macos' and not sys_platform.mac_ver()[0]:
+                platform_name = 'ios'
+
+        if platform_name == 'unknown':
+            logging.warning(f"Unknown platform: {sys.platform}")
+        elif logging.getLogger().isEnabledFor(logging.INFO):
+            _log_platform_details(platform_name)
+        return platform_name
+
     except Exception as e:
         logging.error(f"Platform detection failed: {e}")
         return 'unknown'
 
 # Detect platform and capabilities
+MOBILE_PLATFORMS = frozenset({'android', 'ios'})
+DESKTOP_PLATFORMS = frozenset({'windows', 'macos', 'linux'})
+APPLE_PLATFORMS = frozenset({'macos', 'ios'})
+
 PLATFORM = detect_platform()
-IS_MOBILE = PLATFORM in ['android', 'ios']
-IS_DESKTOP = PLATFORM in ['windows', 'macos', 'linux']
+IS_MOBILE = PLATFORM in MOBILE_PLATFORMS
+IS_DESKTOP = PLATFORM in DESKTOP_PLATFORMS
 IS_WEB = PLATFORM == 'web'
 
-# System capabilities detection
+# Store profiles and settings in a user-specific application directory to avoid permission issues
+APP_DATA_DIR = os.path.join(os.getenv('APPDATA') or os.path.expanduser('~'), 'MathBlast')
 try:
-    import multiprocessing
-    CPU_COUNT = multiprocessing.cpu_count()
-except:
-    CPU_COUNT = 1
+    os.makedirs(APP_DATA_DIR, exist_ok=True)
+except Exception:
+    # fallback to home directory
+    APP_DATA_DIR = os.path.expanduser('~')
 
-try:
-    import psutil
-    TOTAL_RAM = psutil.virtual_memory().total / (1024 * 1024 * 1024)  # GB
-    FREE_RAM = psutil.virtual_memory().available / (1024 * 1024 * 1024)  # GB
-except:
-    TOTAL_RAM = 4  # Conservative default
-    FREE_RAM = 2
+# Hardware probes are cached here and reused until the OS changes or the cache ages out
+CAPS_CACHE_FILE = os.path.join(APP_DATA_DIR, 'caps.json')
+CAPS_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds
+_CAPS_KEYS = ('CPU_COUNT', 'TOTAL_RAM', 'GPU_NAME', 'VRAM', 'SCALE_FACTOR')
+
+def _caps_signature():
+    return [PLATFORM, sys_platform.release(), sys_platform.version()]
+
+def _load_caps_cache():
+    """Return the cached capability values, or None if missing, stale or for another OS."""
+    try:
+        if time.time() - os.path.getmtime(CAPS_CACHE_FILE) > CAPS_CACHE_MAX_AGE:
+            return None
+        with open(CAPS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('signature') != _caps_signature():
+            return None
+        values = cached['values']
+        if not all(key in values for key in _CAPS_KEYS):
+            return None  # partial write or written by another version
+        return values
+    except Exception:
+        return None
+
+def _save_caps_cache(values):
+    tmp = CAPS_CACHE_FILE + ".tmp"
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'signature': _caps_signature(), 'values': values}, f)
+        os.replace(tmp, CAPS_CACHE_FILE)
+    except Exception as e:
+        logging.debug(f"Could not write capabilities cache: {e}")
+
+_cached_caps = _load_caps_cache()
+
+# System capabilities detection
+if _cached_caps:
+    CPU_COUNT = _cached_caps['CPU_COUNT']
+    TOTAL_RAM = _cached_caps['TOTAL_RAM']
+    FREE_RAM = None  # not probed on a cached start
+else:
+    try:
+        import multiprocessing
+        CPU_COUNT = multiprocessing.cpu_count()
+    except:
+        CPU_COUNT = 1
+
+    try:
+        import psutil
+        TOTAL_RAM = psutil.virtual_memory().total / (1024 * 1024 * 1024)  # GB
+        FREE_RAM = psutil.virtual_memory().available / (1024 * 1024 * 1024)  # GB
+    except:
+        TOTAL_RAM = 4  # Conservative default
+        FREE_RAM = 2
 
 # Graphics capabilities detection
-try:
-    if IS_DESKTOP:
-        if PLATFORM == 'windows':
+# Display adapter class key; each adapter is a numbered subkey (0000, 0001, ...)
+DISPLAY_CLASS_KEY = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}"
+
+def _probe_gpu_registry():
+    """Return (name, vram_gb) for the first display adapter, read from the registry.
+
+    Much faster than a WMI Win32_VideoController query, which can take
+    seconds on a cold start.
+    """
+    import winreg
+    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, DISPLAY_CLASS_KEY) as cls:
+        i = 0
+        while True:
+            try:
+                sub = winreg.EnumKey(cls, i)
+            except OSError:
+                return None  # no more subkeys
+            i += 1
+            if not sub.isdigit():
+                continue  # skip 'Properties' and similar
             try:
-                import wmi
-                c = wmi.WMI()
-                gpu_info = c.Win32_VideoController()[0]
-                GPU_NAME = gpu_info.Name
-                VRAM = gpu_info.AdapterRAM / (1024 * 1024 * 1024)  # GB
+                with winreg.OpenKey(cls, sub) as key:
+                    name = winreg.QueryValueEx(key, "DriverDesc")[0]
+                    try:
+                        vram = winreg.QueryValueEx(key, "HardwareInformation.qwMemorySize")[0]
+                    except OSError:
+                        # Older drivers store a 4-byte little-endian REG_BINARY
+                        raw = winreg.QueryValueEx(key, "HardwareInformation.MemorySize")[0]
+                        vram = int.from_bytes(raw, 'little') if isinstance(raw, bytes) else int(raw)
+                    return name, vram / (1024 * 1024 * 1024)  # GB
+            except OSError:
+                continue
+
+GPU_NAME = "Unknown"
+VRAM = 1
+if _cached_caps:
+    GPU_NAME = _cached_caps['GPU_NAME']
+    VRAM = _cached_caps['VRAM']
+else:
+    try:
+        if PLATFORM == 'windows':
+            gpu = _probe_gpu_registry()
+            if gpu:
+                GPU_NAME, VRAM = gpu
                 logging.info(f"Detected GPU: {GPU_NAME} with {VRAM:.1f}GB VRAM")
-            except:
-                GPU_NAME = "Unknown"
-                VRAM = 1
-except:
-    GPU_NAME = "Unknown"
-    VRAM = 1
+    except Exception as e:
+        logging.warning(f"GPU detection failed: {e}")
 
 # Update performance settings based on capabilities
 if TOTAL_RAM >= 16 and VRAM >= 4:
@@ -220,31 +312,53 @@ else:
     RAY_TRACING = False
 
 # Scale factor based on DPI/resolution
-try:
+@functools.lru_cache(maxsize=1)
+def _get_scale_factor():
+    """Return the display scale factor (1.0 = 96 DPI), probed once."""
     if PLATFORM == 'windows':
         try:
             import ctypes
-            user32 = ctypes.windll.user32
+            # Windows 8.1+: one call returns the effective scale (100, 125, 150, ...)
             try:
-                dpi = user32.GetDpiForSystem()
-                SCALE_FACTOR = dpi / 96.0
-            except AttributeError:
-                # Fallback for older Windows versions
-                dc = user32.GetDC(0)
-                dpi = user32.GetDeviceCaps(dc, 88)  # LOGPIXELSX
-                user32.ReleaseDC(0, dc)
-                SCALE_FACTOR = dpi / 96.0
+                shcore = ctypes.windll.shcore
+            except OSError:
+                shcore = None  # no shcore.dll before Windows 8.1
+            get_scale = getattr(shcore, 'GetScaleFactorForDevice', None) if shcore else None
+            if get_scale is not None:
+                scale = get_scale(0)
+                if scale:
+                    return scale / 100.0
+            user32 = ctypes.windll.user32
+            get_dpi = getattr(user32, 'GetDpiForSystem', None)
+            if get_dpi is not None:
+                return get_dpi() / 96.0
+            # Fallback for older Windows versions
+            dc = user32.GetDC(0)
+            dpi = ctypes.windll.gdi32.GetDeviceCaps(dc, 88)  # LOGPIXELSX
+            user32.ReleaseDC(0, dc)
+            return dpi / 96.0
         except Exception as e:
             logging.warning(f"DPI detection failed: {e}")
-            SCALE_FACTOR = 1.0
+            return 1.0
     elif IS_MOBILE:
-        SCALE_FACTOR = 1.5  # Higher default for mobile
-    else:
-        SCALE_FACTOR = 1.0
+        return 1.5  # Higher default for mobile
+    return 1.0
+
+try:
+    SCALE_FACTOR = _cached_caps['SCALE_FACTOR'] if _cached_caps else _get_scale_factor()
 except Exception as e:
     logging.warning(f"Scale factor initialization failed: {e}")
     SCALE_FACTOR = 1.0
 
+if not _cached_caps:
+    _save_caps_cache({
+        'CPU_COUNT': CPU_COUNT,
+        'TOTAL_RAM': TOTAL_RAM,
+        'GPU_NAME': GPU_NAME,
+        'VRAM': VRAM,
+        'SCALE_FACTOR': SCALE_FACTOR,
+    })
+
 logging.info(f"""
 Platform Information:
 --------------------
@@ -253,7 +367,7 @@ Mobile: {IS_MOBILE}
 Desktop: {IS_DESKTOP}
 Web: {IS_WEB}
 CPU Cores: {CPU_COUNT}
-RAM: {TOTAL_RAM:.1f}GB (Free: {FREE_RAM:.1f}GB)
+RAM: {TOTAL_RAM:.1f}GB (Free: {f"{FREE_RAM:.1f}GB" if FREE_RAM is not None else "n/a"})
 GPU: {GPU_NAME}
 VRAM: {VRAM:.1f}GB
 Scale Factor: {SCALE_FACTOR:.2f}x
@@ -264,31 +378,33 @@ Ray Tracing: {RAY_TRACING}
 
 # ------------------- Platform-Specific Imports -------------------
 # Import manager to handle platform-specific dependencies
+@functools.lru_cache(maxsize=None)
+def _import_module(import_path):
+    """importlib.import_module, cached so repeat probes of the same module are free."""
+    return importlib.import_module(import_path)
+
 class PlatformImports:
     def __init__(self):
         self.imports = {}
         self.gui = None
     
     def try_import(self, name, import_path, required=False):
-        """Try to import a module and store its status."""
+        """Try to import a module and store it (None if unavailable)."""
         try:
             if isinstance(import_path, str):
                 # Single import
-                exec(f"import {import_path}")
-                self.imports[name] = True
+                self.imports[name] = _import_module(import_path)
             elif isinstance(import_path, list):
                 # Multiple imports
-                for imp in import_path:
-                    exec(f"import {imp}")
-                self.imports[name] = True
+                self.imports[name] = [_import_module(imp) for imp in import_path]
         except ImportError as e:
-            self.imports[name] = False
+            self.imports[name] = None
             if required:
                 logging.error(f"Failed to import required module {name}: {e}")
             else:
                 logging.debug(f"Optional module {name} not available: {e}")
         except Exception as e:
-            self.imports[name] = False
+            self.imports[name] = None
             logging.error(f"Error importing {name}: {e}")
 
 # Initialize platform imports
@@ -348,24 +464,36 @@ elif IS_MOBILE:
         logging.error(f"Kivy initialization failed: {e}")
 
 # ------------------- Optional Services -------------------
-# Voice Recognition
-VOICE_AVAILABLE = False
-try:
-    import speech_recognition as sr
-    import pyttsx3
-    VOICE_AVAILABLE = True
-    logging.info("Voice recognition initialized")
-except ImportError:
+def _lazy_module(name):
+    """Return a module that is only really imported on first attribute access, or None if missing."""
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or spec.loader is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+# Voice Recognition (heavy imports, deferred until voice mode is used)
+sr = _lazy_module("speech_recognition")
+pyttsx3 = _lazy_module("pyttsx3")
+VOICE_AVAILABLE = sr is not None and pyttsx3 is not None
+if VOICE_AVAILABLE:
+    logging.info("Voice recognition available")
+else:
     logging.debug("Voice recognition not available")
 
 # Steam Integration
-STEAM_AVAILABLE = False
-try:
-    if IS_DESKTOP:
-        from steam.client import SteamClient
-        STEAM_AVAILABLE = True
-        logging.info("Steam integration initialized")
-except ImportError:
+steam_client = _lazy_module("steam.client") if IS_DESKTOP else None
+STEAM_AVAILABLE = steam_client is not None
+if STEAM_AVAILABLE:
+    logging.info("Steam integration available")
+else:
     logging.debug("Steam integration not available")
 
 # ------------------- Mobile Platform Services -------------------
@@ -396,17 +524,17 @@ def init_mobile_services():
                     required=False
                 )
                 ANDROID_SERVICES[service]['available'] = platform_imports.imports.get(
-                    f'android_{service}', False
-                )
+                    f'android_{service}'
+                ) is not None
                 if ANDROID_SERVICES[service]['available']:
                     logging.info(f"Android {service} service initialized")
             except Exception as e:
                 logging.debug(f"Android {service} service not available: {e}")
                 
-    elif PLATFORM in ['macos', 'ios']:
+    elif PLATFORM in APPLE_PLATFORMS:
         for service, info in APPLE_SERVICES.items():
             try:
-                if isinstance(info['modules'], list):
+                if isinstance(info.get('modules'), list):
                     # Service requires multiple modules
                     modules_available = True
                     for module in info['modules']:
@@ -427,8 +555,8 @@ def init_mobile_services():
                         required=False
                     )
                     APPLE_SERVICES[service]['available'] = platform_imports.imports.get(
-                        f'apple_{service}', False
-                    )
+                        f'apple_{service}'
+                    ) is not None
                     
                 if APPLE_SERVICES[service]['available']:
                     logging.info(f"Apple {service} service initialized")
@@ -442,7 +570,7 @@ if IS_MOBILE:
 # Initialize Apple Services
 def init_apple_services():
     """Initialize Apple platform services if available."""
-    if not PLATFORM in ['macos', 'ios']:
+    if not PLATFORM in APPLE_PLATFORMS:
         return
         
     if APPLE_SERVICES['game_center']['available']:
@@ -561,7 +689,7 @@ def sync_profiles_to_icloud():
         pass
 
 # Initialize services based on platform
-if PLATFORM in ['macos', 'ios']:
+if PLATFORM in APPLE_PLATFORMS:
     init_apple_services()
 elif PLATFORM == 'android':
     # Android services are initialized on demand
@@ -629,7 +757,7 @@ def play_sfx(event_name, root=None):
     except Exception:
         pass
 
-AVATARS = ["🧑", "👧", "🐱", "🐶", "🐼", "🐰", "🦊", "🐸", "🦁", "🐯", "🦄", "🐲"]
+AVATARS = ("🧑", "👧", "🐱", "🐶", "🐼", "🐰", "🦊", "🐸", "🦁", "🐯", "🦄", "🐲")
 DEFAULT_AVATAR = AVATARS[0]
 
 LANGUAGES = {
@@ -638,16 +766,11 @@ LANGUAGES = {
     'fr': {'name': 'Français', 'play': 'Jouer', 'level': 'Niveau', 'correct': 'Correct !', 'wrong': 'Faux !', 'game_over': 'Jeu Terminé !'},
     'de': {'name': 'Deutsch', 'play': 'Spielen', 'level': 'Stufe', 'correct': 'Richtig!', 'wrong': 'Falsch!', 'game_over': 'Spiel Vorbei!'}
 }
+# Freeze each language into a namedtuple so lookups are attribute reads (LANGUAGES[code].name)
+LangStrings = namedtuple('LangStrings', 'name play level correct wrong game_over')
+LANGUAGES = {code: LangStrings(**strings) for code, strings in LANGUAGES.items()}
 CURRENT_LANG = 'en'
 
-# Store profiles and settings in a user-specific application directory to avoid permission issues
-APP_DATA_DIR = os.path.join(os.getenv('APPDATA') or os.path.expanduser('~'), 'MathBlast')
-try:
-    os.makedirs(APP_DATA_DIR, exist_ok=True)
-except Exception:
-    # fallback to home directory
-    APP_DATA_DIR = os.path.expanduser('~')
-
 PROFILES_FILE = os.path.join(APP_DATA_DIR, 'profiles.json')
 SETTINGS_FILE = os.path.join(APP_DATA_DIR, 'settings.json')
 
@@ -733,13 +856,37 @@ def font_size(base):
         return int(base)
 
 # ------------------- Profile System -------------------
-def load_profiles():
+# orjson is much faster than the stdlib json module; use it when installed
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+def _json_dumps(obj):
+    """Serialize obj to indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Profiles are kept in memory; rapid saves are batched into one write
+PROFILE_SAVE_DELAY = 0.5  # seconds
+_profiles_cache = None
+_profiles_dirty = False  # set by write_profiles, cleared once written
+_profiles_lock = threading.RLock()
+_profiles_timer = None
+
+def _read_profiles_file():
     if not os.path.exists(PROFILES_FILE):
         logging.debug(f"Profiles file does not exist: {PROFILES_FILE}")
         return {}
     try:
-        with open(PROFILES_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(PROFILES_FILE, 'rb') as f:
+            data = _json_loads(f.read())
             if isinstance(data, dict):
                 return data
             logging.warning(f"Profiles file malformed (expected dict), resetting: {PROFILES_FILE}")
@@ -757,39 +904,31 @@ def load_profiles():
         logging.error(f"Failed to read profiles: {e}")
         return {}
 
-def save_profile(name, level, correct, stats=None):
-    if not name:
-        logging.error("Cannot save profile: empty name")
-        return False
-        
-    try:
-        profiles = load_profiles()
-        p = profiles.setdefault(name, {
-            "level": 1, 
-            "correct": 0,
-            "lang": CURRENT_LANG,
-            "avatar": "Brain",
-            "created": int(time.time()),
-            "last_played": int(time.time())
-        })
-        
-        p["level"] = max(level, p.get("level", 1))
-        p["correct"] = correct + p.get("correct", 0)
-        p["lang"] = CURRENT_LANG
-        p["last_played"] = int(time.time())
-        
-        if stats:
-            curr_stats = p.get("stats", {})
-            curr_stats.update(stats)
-            p["stats"] = curr_stats
-
+def load_profiles():
+    """Return the profiles dict (read from disk once, then served from memory)."""
+    global _profiles_cache
+    with _profiles_lock:
+        if _profiles_cache is None:
+            _profiles_cache = _read_profiles_file()
+        return _profiles_cache
+
+def flush_profiles():
+    """Write the in-memory profiles to disk now, if there is a pending save."""
+    global _profiles_timer, _profiles_dirty
+    with _profiles_lock:
+        if _profiles_timer is not None:
+            _profiles_timer.cancel()
+            _profiles_timer = None
+        if not _profiles_dirty or _profiles_cache is None:
+            return True
         # write atomically using a temporary file
         tmp = PROFILES_FILE + ".tmp"
         try:
-            with open(tmp, 'w', encoding='utf-8') as f:
-                json.dump(profiles, f, indent=2, ensure_ascii=False)
+            with open(tmp, 'wb') as f:
+                f.write(_json_dumps(_profiles_cache))
             os.replace(tmp, PROFILES_FILE)
-            logging.info(f"Profile saved: {name} -> {PROFILES_FILE}")
+            _profiles_dirty = False
+            logging.info(f"Profiles saved -> {PROFILES_FILE}")
             return True
         except Exception as e:
             logging.error(f"Profile save failed: {e}")
@@ -798,22 +937,94 @@ def save_profile(name, level, correct, stats=None):
                     os.remove(tmp)
             except Exception:
                 pass
+            # still dirty, try again later
+            _schedule_profiles_flush()
             return False
+
+def write_profiles(profiles, immediate=False):
+    """Replace the stored profiles; written after PROFILE_SAVE_DELAY unless immediate."""
+    global _profiles_cache, _profiles_timer, _profiles_dirty
+    with _profiles_lock:
+        _profiles_cache = profiles
+        _profiles_dirty = True
+        if immediate:
+            return flush_profiles()
+        _schedule_profiles_flush()
+        return True
+
+def _schedule_profiles_flush():
+    """Arm the delayed write (call with _profiles_lock held)."""
+    global _profiles_timer
+    if _profiles_timer is None:
+        _profiles_timer = threading.Timer(PROFILE_SAVE_DELAY, flush_profiles)
+        _profiles_timer.daemon = True
+        _profiles_timer.start()
+
+atexit.register(flush_profiles)
+
+def save_profile(name, level, correct, stats=None):
+    if not name:
+        logging.error("Cannot save profile: empty name")
+        return False
+        
+    try:
+        with _profiles_lock:
+            profiles = load_profiles()
+            p = profiles.setdefault(name, {
+                "level": 1, 
+                "correct": 0,
+                "lang": CURRENT_LANG,
+                "avatar": "Brain",
+                "created": int(time.time()),
+                "last_played": int(time.time())
+            })
+            
+            p["level"] = max(level, p.get("level", 1))
+            p["correct"] = correct + p.get("correct", 0)
+            p["lang"] = CURRENT_LANG
+            p["last_played"] = int(time.time())
+            
+            if stats:
+                curr_stats = p.get("stats", {})
+                curr_stats.update(stats)
+                p["stats"] = curr_stats
+
+            logging.debug(f"Profile updated: {name}")
+            return write_profiles(profiles)
     except Exception as e:
         logging.error(f"Profile save failed (outer): {e}")
         return False
 
 # ------------------- Math Engine -------------------
+# Optional NumPy for generating problems in batches
+try:
+    import numpy as np
+    _np_rng = np.random.default_rng()
+except Exception:
+    np = None
+    _np_rng = None
+
+PROBLEM_BATCH = 64
+
+# '/' problems are built to divide exactly, so floordiv gives the int answer
+_OPS = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.floordiv}
+
+def _problem_ops(level):
+    return ['+', '-', '*'] + (['/'] if level >= 3 else []) + (['sqrt'] if level >= 7 else [])
+
+def _problem_max(level, multiplier):
+    # scale ranges based on level and multiplier
+    return max(2, int(min(100, (10 + level * 5) * multiplier)))
+
 def generate_problem(level, multiplier=1.0):
     """Generate a math problem. Multiplier (0.5-2.0) scales difficulty/operand size.
 
     Returns: (problem_str, answer_str)
     """
-    ops = ['+', '-', '*'] + (['/'] if level >= 3 else []) + (['sqrt'] if level >= 7 else [])
+    ops = _problem_ops(level)
     op = random.choice(ops)
 
-    # scale ranges based on level and multiplier
-    base_max = max(2, int(min(100, (10 + level * 5) * multiplier)))
+    base_max = _problem_max(level, multiplier)
 
     if op == 'sqrt':
         # pick a perfect square within range
@@ -833,11 +1044,47 @@ def generate_problem(level, multiplier=1.0):
         a = b * random.randint(1, max(1, base_max//b))
 
     expr = f"{a} {op} {b} = ?"
-    try:
-        ans = eval(f"{a}{op}{b}")
-    except Exception:
-        ans = a
-    return expr, str(int(ans)) if isinstance(ans, int) or ans == int(ans) else f"{ans:.2f}"
+    ans = _OPS[op](a, b)
+    return expr, str(ans)
+
+# Pre-generated uniform draws in [0, 1), one row per problem. They are scaled
+# to the current level/range when used, so multiplier changes don't waste them.
+_problem_draws = []
+
+def _pick(u, k):
+    """Map a uniform draw u in [0, 1) to an int in [0, k)."""
+    return min(int(u * k), k - 1)
+
+def draw_problem(level, multiplier=1.0):
+    """Return the next problem, built from a batch of NumPy random draws.
+
+    Same distribution as generate_problem(), which is used when NumPy is missing.
+    Returns: (problem_str, answer_str)
+    """
+    if np is None:
+        return generate_problem(level, multiplier)
+    if not _problem_draws:
+        # columns: operator, a, b, divisor, quotient, root
+        _problem_draws.extend(_np_rng.random((PROBLEM_BATCH, 6)).tolist())
+    u_op, u_a, u_b, u_div, u_q, u_root = _problem_draws.pop()
+
+    ops = _problem_ops(level)
+    base_max = _problem_max(level, multiplier)
+    op = ops[_pick(u_op, len(ops))]
+
+    if op == 'sqrt':
+        # root in [2, int(sqrt(base_max)) + 1], as in generate_problem
+        root = 2 + _pick(u_root, int(base_max ** 0.5))
+        return f"√{root * root} = ?", str(root)
+    if op == '/':
+        # ensure divisible
+        b = 1 + _pick(u_div, max(1, base_max // 2))
+        q = 1 + _pick(u_q, max(1, base_max // b))
+        return f"{b * q} / {b} = ?", str(q)
+
+    a = 1 + _pick(u_a, base_max)
+    b = 1 + _pick(u_b, base_max)
+    return f"{a} {op} {b} = ?", str(_OPS[op](a, b))
 
 # ------------------- Adaptive Engine -------------------
 class AdaptiveEngine:
@@ -846,21 +1093,32 @@ class AdaptiveEngine:
     Keeps a short history of recent attempts and computes a skill score (10-100).
     The engine exposes get_difficulty_multiplier() which returns 0.5-2.0 multiplier.
     """
+    HISTORY_SIZE = 20
+
     def __init__(self):
-        self.history = []  # list of (time_taken, correct, level)
+        self.history = deque(maxlen=self.HISTORY_SIZE)  # (time_taken, correct, level)
+        # running totals over history so update() doesn't rescan it
+        self._correct_sum = 0
+        self._time_sum = 0.0
         self.skill_score = 50
         self.streak = 0
 
     def update(self, time_taken, correct, level):
-        self.history.append((time_taken, bool(correct), level))
-        if len(self.history) > 20:
-            self.history.pop(0)
+        correct = bool(correct)
+        if len(self.history) == self.history.maxlen:
+            # the deque is about to evict its oldest entry
+            old_time, old_correct, _ = self.history[0]
+            self._time_sum -= old_time
+            self._correct_sum -= old_correct
+        self.history.append((time_taken, correct, level))
+        self._time_sum += time_taken
+        self._correct_sum += correct
 
         # Accuracy
-        accuracy = sum(1 for _, c, _ in self.history if c) / max(1, len(self.history))
+        accuracy = self._correct_sum / len(self.history)
 
         # Speed (lower = better)
-        avg_time = sum(t for t, _, _ in self.history) / max(1, len(self.history))
+        avg_time = self._time_sum / len(self.history)
         speed_score = max(0, 100 - avg_time * 10)
 
         # Streak bonus
@@ -884,10 +1142,9 @@ class AdaptiveEngine:
 class VoiceMath:
     def __init__(self):
         self.active = False
-        self.recognizer = sr.Recognizer() if VOICE_AVAILABLE else None
-        self.tts = pyttsx3.init() if VOICE_AVAILABLE else None
-        if self.tts:
-            self.tts.setProperty('rate', 150)
+        # created in start() so the speech libraries load only when voice mode is used
+        self.recognizer = None
+        self.tts = None
 
     def speak(self, text):
         if self.tts:
@@ -896,6 +1153,20 @@ class VoiceMath:
             self.tts.runAndWait()
 
     def start(self):
+        global VOICE_AVAILABLE
+        if VOICE_AVAILABLE:
+            try:
+                # first use triggers the real (lazy) import, which can still fail
+                if self.recognizer is None:
+                    self.recognizer = sr.Recognizer()
+                if self.tts is None:
+                    self.tts = pyttsx3.init()
+                    self.tts.setProperty('rate', 150)
+            except Exception as e:
+                logging.error(f"Voice engine failed to load: {e}")
+                self.recognizer = None
+                self.tts = None
+                VOICE_AVAILABLE = False
         if not VOICE_AVAILABLE:
             messagebox.showinfo("Voice Mode", "Install pyttsx3 and SpeechRecognition.")
             return
@@ -944,22 +1215,27 @@ except Exception:
         return
 
 # ------------------- Handwriting recognizer (ONNX stub) -------------------
+class ONNXRecognizer:
+    def __init__(self, sess):
+        self.sess = sess
+    def predict(self, strokes):
+        # Placeholder: real implementation converts strokes -> model input
+        return ""  # empty string until model is hooked
+
 handwriting_recognizer = None
-try:
-    import onnxruntime as ort
-    try:
-        recognizer = ort.InferenceSession("math_handwriting.onnx")
-        class ONNXRecognizer:
-            def __init__(self, sess):
-                self.sess = sess
-            def predict(self, strokes):
-                # Placeholder: real implementation converts strokes -> model input
-                return ""  # empty string until model is hooked
-        handwriting_recognizer = ONNXRecognizer(recognizer)
-    except Exception:
-        handwriting_recognizer = None
-except Exception:
-    handwriting_recognizer = None
+_handwriting_checked = False
+
+def get_handwriting_recognizer():
+    """Load onnxruntime and the handwriting model on first use."""
+    global handwriting_recognizer, _handwriting_checked
+    if not _handwriting_checked:
+        _handwriting_checked = True
+        try:
+            import onnxruntime as ort
+            handwriting_recognizer = ONNXRecognizer(ort.InferenceSession("math_handwriting.onnx"))
+        except Exception:
+            handwriting_recognizer = None
+    return handwriting_recognizer
 
 
 # ------------------- GUI: Tkinter (Desktop) -------------------
@@ -992,7 +1268,7 @@ class MathBlastTk:
             self.setup_xbox_features()
             
         # Apple Platform
-        elif PLATFORM in ['macos', 'ios']:
+        elif PLATFORM in APPLE_PLATFORMS:
             if PLATFORM_SERVICES['game_center']['initialized']:
                 self.setup_game_center()
             if PLATFORM_SERVICES['icloud']['initialized']:
@@ -1083,7 +1359,7 @@ class MathBlastTk:
                     PLATFORM_SERVICES['xbox']['initialized'] = False
                     
             # Apple Platform
-            elif PLATFORM in ['macos', 'ios'] and PLATFORM_SERVICES['game_center']['initialized']:
+            elif PLATFORM in APPLE_PLATFORMS and PLATFORM_SERVICES['game_center']['initialized']:
                 self.award_achievement(achievement_id)
                 
             # Android Platform
@@ -1097,7 +1373,7 @@ class MathBlastTk:
                 
             # Steam (Cross-platform)
             if PLATFORM_SERVICES['steam']['initialized']:
-                client = SteamClient()
+                client = steam_client.SteamClient()
                 client.achievements.unlock(self.steam_achievements[achievement_id])
                 
         except Exception as e:
@@ -1116,7 +1392,7 @@ class MathBlastTk:
                     PLATFORM_SERVICES['xbox']['initialized'] = False
                     
             # Apple Platform
-            elif PLATFORM in ['macos', 'ios'] and PLATFORM_SERVICES['game_center']['initialized']:
+            elif PLATFORM in APPLE_PLATFORMS and PLATFORM_SERVICES['game_center']['initialized']:
                 self.update_score(stat_type, value)
                 
             # Android Platform
@@ -1130,7 +1406,7 @@ class MathBlastTk:
                 
             # Steam (Cross-platform)
             if PLATFORM_SERVICES['steam']['initialized']:
-                client = SteamClient()
+                client = steam_client.SteamClient()
                 client.stats.set_stat(self.steam_stats[stat_type], value)
                 
         except Exception as e:
@@ -1149,7 +1425,7 @@ class MathBlastTk:
                     PLATFORM_SERVICES['windows_cloud']['initialized'] = False
                     
             # Apple Platform
-            elif PLATFORM in ['macos', 'ios'] and PLATFORM_SERVICES['icloud']['initialized']:
+            elif PLATFORM in APPLE_PLATFORMS and PLATFORM_SERVICES['icloud']['initialized']:
                 self.sync_profile()
                 
             # Android Platform
@@ -1226,7 +1502,7 @@ class MathBlastTk:
             
     def award_achievement(self, achievement_id):
         """Report achievement to Game Center."""
-        if not (PLATFORM in ['macos', 'ios'] and APPLE_SERVICES['game_center']):
+        if not (PLATFORM in APPLE_PLATFORMS and APPLE_SERVICES['game_center']):
             return
             
         try:
@@ -1242,7 +1518,7 @@ class MathBlastTk:
             
     def update_score(self, score_type='high_score', value=None):
         """Update score on Game Center leaderboard."""
-        if not (PLATFORM in ['macos', 'ios'] and APPLE_SERVICES['game_center']):
+        if not (PLATFORM in APPLE_PLATFORMS and APPLE_SERVICES['game_center']):
             return
             
         try:
@@ -1255,7 +1531,7 @@ class MathBlastTk:
             
     def sync_profile(self):
         """Sync current profile to iCloud."""
-        if not (PLATFORM in ['macos', 'ios'] and APPLE_SERVICES['icloud']):
+        if not (PLATFORM in APPLE_PLATFORMS and APPLE_SERVICES['icloud']):
             return
             
         try:
@@ -1667,14 +1943,15 @@ class MathBlastTk:
             thresholds = {1:1, 2:3, 3:6, 4:9, 5:12}
             name = self.current_profile_name or get_current_profile() or "Player"
             profiles = load_profiles()
-            p = profiles.setdefault(name, {})
+            p = profiles.get(name, {})
             current_unlocked = p.get('adventure_unlocked', 1)
             new_unlocked = current_unlocked
             for ch, lvl in thresholds.items():
                 if self.level >= lvl and ch > new_unlocked:
                     new_unlocked = ch
             if new_unlocked != current_unlocked:
-                p['adventure_unlocked'] = new_unlocked
+                with _profiles_lock:
+                    p['adventure_unlocked'] = new_unlocked
                 # save via save_profile to merge safely
                 save_profile(name, self.level, self.total_correct, stats={'adventure_unlocked': new_unlocked})
         except Exception as e:
@@ -1693,7 +1970,7 @@ class MathBlastTk:
         except Exception:
             multiplier = 1.0
 
-        problem, answer = generate_problem(self.level, multiplier)
+        problem, answer = draw_problem(self.level, multiplier)
         self.current_answer = answer
         # mark start time for adaptive timing
         self.problem_start_time = time.time()
@@ -1759,7 +2036,7 @@ class MathBlastTk:
             multiplier = self.adaptive.get_difficulty_multiplier()
         except Exception:
             multiplier = 1.0
-        problem, answer = generate_problem(self.level, multiplier)
+        problem, answer = draw_problem(self.level, multiplier)
         self.current_answer = answer
         self.problem_label.config(text=problem, fg=THEME["text"])
         # reset timer for adaptive engine
@@ -2072,15 +2349,14 @@ class MathBlastTk:
                     "This cannot be undone."):
                     return
                     
-                # Remove from profiles
-                profiles.pop(name, None)
+                # Remove from profiles (the flush timer may be serializing them)
+                with _profiles_lock:
+                    profiles.pop(name, None)
                 
                 # Save to file atomically
                 try:
-                    tmp = PROFILES_FILE + ".tmp"
-                    with open(tmp, 'w', encoding='utf-8') as f:
-                        json.dump(profiles, f, indent=2)
-                    os.replace(tmp, PROFILES_FILE)
+                    if not write_profiles(profiles, immediate=True):
+                        raise IOError("could not write profiles file")
                     
                     # Update UI
                     tree.delete(item)
@@ -2156,13 +2432,11 @@ class MathBlastTk:
                     name = tree.item(item)['text']
                     profiles = load_profiles()
                     if name in profiles:
-                        profiles[name]['avatar'] = avatar
+                        with _profiles_lock:
+                            profiles[name]['avatar'] = avatar
                         # Save atomically
                         try:
-                            tmp = PROFILES_FILE + ".tmp"
-                            with open(tmp, 'w', encoding='utf-8') as f:
-                                json.dump(profiles, f, indent=2, ensure_ascii=False)
-                            os.replace(tmp, PROFILES_FILE)
+                            write_profiles(profiles)
                             # Update tree
                             tree.set(item, 'avatar', avatar)
                             update_stats()  # Refresh stats display
@@ -2229,7 +2503,7 @@ class MathBlastTk:
                     bg=THEME["bg"]).pack(side=tk.LEFT, padx=5)
             lang_var = tk.StringVar(value=CURRENT_LANG)
             lang_menu = ttk.Combobox(lang_select_frame, textvariable=lang_var, 
-                                   values=[f"{code} - {LANGUAGES[code]['name']}" 
+                                   values=[f"{code} - {LANGUAGES[code].name}" 
                                           for code in LANGUAGES],
                                    state="readonly", width=20)
             lang_menu.pack(side=tk.LEFT, padx=5)
@@ -2969,7 +3243,7 @@ class MathBlastTk:
                         ("⚡ Best Streak", p.get('best_streak', 0)),
                         ("⏱️ Average Time", f"{p.get('avg_time', 0):.1f}s"),
                         ("📅 Created", datetime.datetime.fromtimestamp(p.get('created', 0)).strftime('%Y-%m-%d')),
-                        ("🗣️ Language", LANGUAGES[p.get('lang', CURRENT_LANG)]['name'])
+                        ("🗣️ Language", LANGUAGES[p.get('lang', CURRENT_LANG)].name)
                     ]
                     
                     # Clear previous stats
@@ -3312,7 +3586,7 @@ if GUI == 'kivy' and all(platform_imports.imports.get(f'kivy_{mod}', False)
                 
                 # Problem display
                 multiplier = self.adaptive.get_difficulty_multiplier()
-                problem, answer = generate_problem(self.level, multiplier)
+                problem, answer = draw_problem(self.level, multiplier)
                 self.current_answer = answer
                 self.problem_start_time = time.time()
                 
@@ -3428,7 +3702,7 @@ if GUI == 'kivy' and all(platform_imports.imports.get(f'kivy_{mod}', False)
         def next_problem(self, dt=None):
             try:
                 multiplier = self.adaptive.get_difficulty_multiplier()
-                problem, answer = generate_problem(self.level, multiplier)
+                problem, answer = draw_problem(self.level, multiplier)
                 self.current_answer = answer
                 self.problem_label.text = problem
                 self.problem_label.color = (1, 1, 1, 1)  # White
@@ -3623,7 +3897,7 @@ def init_platform_features():
             verify_service('windows_cloud', test_windows_cloud)
         
         # Apple Platform Services
-        elif PLATFORM in ['macos', 'ios']:
+        elif PLATFORM in APPLE_PLATFORMS:
             # Game Center 
             def test_game_center():
                 try:
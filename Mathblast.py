@@ -14,6 +14,7 @@ import threading
 import platform as sys_platform
 import logging
 import time
+import operator as _op
 
 # ------------------- Logging -------------------
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -126,22 +127,34 @@ def save_profile(name, level, correct, stats=None):
         logging.error(f"Save failed: {e}")
 
 # ------------------- Math Engine -------------------
+# '/' problems are built to divide evenly, so floordiv keeps answers ints
+_OPS = {'+': _op.add, '-': _op.sub, '*': _op.mul, '/': _op.floordiv}
+# Operators unlocked so far: '/' at level 3, 'sqrt' at level 7
+_OPS_BASE = ('+', '-', '*')
+_OPS_L3 = _OPS_BASE + ('/',)
+_OPS_L7 = _OPS_L3 + ('sqrt',)
+_SQUARES = (4, 9, 16, 25, 36, 49, 64, 81, 100, 121, 144, 169, 196, 225)
+# Problem RNG: randrange skips randint's wrapper, and _rng.seed() makes runs repeatable
+_rng = random.Random()
+_rr = _rng.randrange
+_rc = _rng.choice
+
 def generate_problem(level):
-    ops = ['+', '-', '*'] + (['/'] if level >= 3 else []) + (['sqrt'] if level >= 7 else [])
-    op = random.choice(ops)
+    ops = _OPS_L7 if level >= 7 else _OPS_L3 if level >= 3 else _OPS_BASE
+    op = _rc(ops)
     
     if op == 'sqrt':
-        n = random.choice([4,9,16,25,36,49,64,81,100,121,144,169,196,225])
+        n = _rc(_SQUARES)
         ans = int(n ** 0.5)
         return f"√{n} = ?", str(ans)
     elif op in '+-*/':
-        a = random.randint(1, min(50, 10 + level*5))
-        b = random.randint(1, min(50, 10 + level*5))
+        mx = min(50, 10 + level*5)
+        a = _rr(1, mx + 1)
+        b = _rr(1, mx + 1)
         if op == '/' and b != 0:
             a = a * b
         expr = f"{a} {op} {b} = ?"
-        ans = eval(f"{a}{op}{b}")
-        return expr, str(int(ans)) if ans == int(ans) else f"{ans:.2f}"
+        return expr, str(_OPS[op](a, b))
     return "5 + 5 = ?", "10"
 
 # ------------------- Voice Engine (Bluetooth + Screen Off) -------------------